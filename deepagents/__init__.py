@@ -1,26 +1,19 @@
+"""Repo-root shim: load ``libs/deepagents/deepagents`` as the one ``deepagents`` package."""
+
 from __future__ import annotations
 
+import importlib.util
+import sys
 from pathlib import Path
 
-# Ensure the editable deepagents package is discoverable when running from repo root.
 _LIB_ROOT = Path(__file__).resolve().parent / "libs" / "deepagents" / "deepagents"
 if _LIB_ROOT.is_dir():
-    __path__.append(str(_LIB_ROOT))  # type: ignore[name-defined]
-
-from .graph import create_deep_agent
-from .middleware.filesystem import FilesystemMiddleware
-from .middleware.memory import MemoryMiddleware
-from .middleware.subagents import CompiledSubAgent, SubAgent, SubAgentMiddleware
-from .skills.middleware import SkillsMiddleware
-from .skills.types import SkillMetadata
-
-__all__ = [
-    "CompiledSubAgent",
-    "FilesystemMiddleware",
-    "MemoryMiddleware",
-    "SkillMetadata",
-    "SkillsMiddleware",
-    "SubAgent",
-    "SubAgentMiddleware",
-    "create_deep_agent",
-]
+    _spec = importlib.util.spec_from_file_location(
+        __name__,
+        _LIB_ROOT / "__init__.py",
+        submodule_search_locations=[str(_LIB_ROOT)],
+    )
+    _module = importlib.util.module_from_spec(_spec)
+    # The import system returns whatever is in sys.modules once this file finishes executing.
+    sys.modules[__name__] = _module
+    _spec.loader.exec_module(_module)
@@ -1,11 +1,45 @@
 """DeepAgents package."""
 
-from deepagents.graph import create_deep_agent
-from deepagents.middleware.filesystem import FilesystemMiddleware
-from deepagents.middleware.memory import MemoryMiddleware
-from deepagents.middleware.subagents import CompiledSubAgent, SubAgent, SubAgentMiddleware
-from deepagents.skills.middleware import SkillsMiddleware
-from deepagents.skills.types import SkillMetadata
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from deepagents.graph import create_deep_agent
+    from deepagents.middleware.filesystem import FilesystemMiddleware
+    from deepagents.middleware.memory import MemoryMiddleware
+    from deepagents.middleware.subagents import CompiledSubAgent, SubAgent, SubAgentMiddleware
+    from deepagents.skills.middleware import SkillsMiddleware
+    from deepagents.skills.types import SkillMetadata
+
+# Public name -> defining module. Resolved on first attribute access (PEP 562) so
+# importing a lightweight submodule does not pull in langchain's middleware stack.
+_LAZY_IMPORTS = {
+    "CompiledSubAgent": "deepagents.middleware.subagents",
+    "FilesystemMiddleware": "deepagents.middleware.filesystem",
+    "MemoryMiddleware": "deepagents.middleware.memory",
+    "SkillMetadata": "deepagents.skills.types",
+    "SkillsMiddleware": "deepagents.skills.middleware",
+    "SubAgent": "deepagents.middleware.subagents",
+    "SubAgentMiddleware": "deepagents.middleware.subagents",
+    "create_deep_agent": "deepagents.graph",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_IMPORTS])
+
 
 __all__ = [
     "CompiledSubAgent",
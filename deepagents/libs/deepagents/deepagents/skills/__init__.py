@@ -1,14 +1,36 @@
 """Skills utilities for deepagents."""
 
-from deepagents.skills.load import list_skills, normalize_skills_dirs
-from deepagents.skills.middleware import SKILLS_STATE_KEY, SkillsMiddleware, render_skills_system_prompt
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from deepagents.skills.load import list_skills, list_skills_from_index, normalize_skills_dirs, write_skills_index
 from deepagents.skills.types import SkillMetadata
 
+if TYPE_CHECKING:
+    from deepagents.skills.middleware import SKILLS_STATE_KEY, SkillsMiddleware, render_skills_system_prompt
+
+# The middleware depends on langchain; only import it when one of these is used.
+_MIDDLEWARE_EXPORTS = frozenset({"SKILLS_STATE_KEY", "SkillsMiddleware", "render_skills_system_prompt"})
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MIDDLEWARE_EXPORTS:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module("deepagents.skills.middleware"), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     "SKILLS_STATE_KEY",
     "SkillMetadata",
     "SkillsMiddleware",
     "list_skills",
+    "list_skills_from_index",
     "normalize_skills_dirs",
     "render_skills_system_prompt",
+    "write_skills_index",
 ]
@@ -0,0 +1,31 @@
+"""Prebuild a `skills.json` index for one or more skills directories.
+
+Usage: `python -m deepagents.skills.build_index <dir> [<dir> ...]`
+
+`list_skills` loads the index instead of walking the directory as long as the
+index is at least as new as the directory contents.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from deepagents.skills.load import write_skills_index
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if not args:
+        print("usage: python -m deepagents.skills.build_index <skills_dir> [<skills_dir> ...]", file=sys.stderr)
+        return 2
+    for root in args:
+        if not Path(root).expanduser().is_dir():
+            print(f"Not a directory: {root}", file=sys.stderr)
+            return 1
+        print(write_skills_index(root))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,119 @@
 from __future__ import annotations
 
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Sequence
+from typing import Callable, Iterator, List, Sequence
 import re
 
-import yaml
-
 from deepagents.skills.types import SkillMetadata
 
-_FRONTMATTER_RE = re.compile(r"\A---\s*\r?\n(.*?)\r?\n---\s*(?:\r?\n|$)", re.DOTALL)
+# `key: value` with a plain scalar value that YAML would load as the same string.
+# Values YAML rejects or types specially -- a trailing `:`, the bare `=` value
+# key and the `<<` merge key -- fail the match and go to the YAML parser.
+_SIMPLE_LINE_RE = re.compile(
+    r"([A-Za-z_][\w-]*):[ \t]+(?!(?:=|<<)$)([^\s'\"\[\]{}&*!|>%@`#,?:\-+.\d~][^\t]*)(?<!:)"
+)
+_YAML_TYPED_WORDS = frozenset({"null", "true", "false", "yes", "no", "on", "off", "y", "n"})
+_FRONTMATTER_READ_BYTES = 4096
+SKILL_FILENAME = "SKILL.md"
+SKILLS_INDEX_FILENAME = "skills.json"
+DEFAULT_SKIP_DIRS = frozenset({".git", "node_modules", "__pycache__", ".venv"})
+_MAX_READ_WORKERS = min(16, (os.cpu_count() or 1) * 4)
+# Shared across calls so repeated before_agent scans do not pay thread startup.
+_EXECUTOR: ThreadPoolExecutor | None = None
+
+# (resolved root, virtual root, cwd when unmapped) -> (tree signature and index mtime, skills under that root)
+_SKILLS_CACHE: dict[tuple[str, str | None, str | None], tuple[tuple[tuple[int, int], int | None], list[SkillMetadata]]] = {}
+
+
+@lru_cache(maxsize=1)
+def _yaml_loader() -> type:
+    try:
+        from yaml import CSafeLoader as loader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader as loader
+    return loader
+
+
+def _parse_simple_frontmatter(block: str) -> dict | None:
+    """Parse flat `key: value` frontmatter without YAML; None if the block needs a real parser."""
+    data: dict = {}
+    for line in block.splitlines():
+        if not line.strip():
+            continue
+        match = _SIMPLE_LINE_RE.fullmatch(line.rstrip())
+        if match is None:
+            return None
+        value = match.group(2)
+        if ": " in value or " #" in value or value.lower() in _YAML_TYPED_WORDS:
+            return None
+        data[match.group(1)] = value
+    return data
+
+
+def _split_frontmatter(text: str) -> str | None:
+    """Return the block between the opening and closing `---` lines, or None."""
+    lines = text.splitlines()
+    if not lines or lines[0].rstrip() != "---":
+        return None
+    for index in range(1, len(lines)):
+        if lines[index].rstrip() == "---":
+            return "\n".join(lines[1:index])
+    return None
 
 
 def _parse_frontmatter(text: str) -> dict:
-    match = _FRONTMATTER_RE.match(text)
-    if not match:
+    block = _split_frontmatter(text)
+    if block is None:
         return {}
+    data = _parse_simple_frontmatter(block)
+    if data is not None:
+        return data
+    import yaml  # deferred: only needed when the fast path above gives up
+
     try:
-        data = yaml.safe_load(match.group(1))
+        data = yaml.load(block, Loader=_yaml_loader())  # noqa: S506 - safe loader
     except yaml.YAMLError:
         return {}
     return data or {}
 
 
+def _decode(data: bytes) -> str:
+    # Frontmatter is almost always ASCII; latin-1 maps those bytes 1:1 without UTF-8 validation.
+    if data.isascii():
+        return data.decode("latin-1")
+    return data.decode("utf-8", errors="replace")
+
+
+def _read_frontmatter_text(skill_md: Path) -> str:
+    with skill_md.open("rb") as f:
+        head = f.read(_FRONTMATTER_READ_BYTES)
+        text = _decode(head)
+        # Frontmatter longer than the head read: fall back to the whole file.
+        if len(head) == _FRONTMATTER_READ_BYTES and text.startswith("---") and _split_frontmatter(text) is None:
+            text = _decode(head + f.read())
+    return text
+
+
+def _iter_skill_files(root_path: Path) -> Iterator[Path]:
+    stack = [str(root_path)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in DEFAULT_SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name == SKILL_FILENAME:
+                        yield Path(entry.path)
+        except OSError:
+            continue
+
+
 def _normalize_virtual_root(virtual_root: str) -> str:
     normalized = virtual_root.replace("\\", "/").strip()
     if not normalized.startswith("/"):
@@ -29,19 +121,144 @@ def _normalize_virtual_root(virtual_root: str) -> str:
     return normalized.rstrip("/")
 
 
-def _default_virtual_path(skill_md: Path) -> str:
+def _skill_path_resolver(root: Path, virtual_root: str | None) -> Callable[[Path], str]:
+    """Return a function mapping a SKILL.md under `root` to the path shown to the agent."""
+    if virtual_root:
+        return lambda skill_md: f"{virtual_root}/{skill_md.relative_to(root).as_posix()}"
+    # The walker does not follow directory symlinks, so resolving the root once
+    # gives the same answer as resolving every SKILL.md.
     try:
-        relative = skill_md.resolve().relative_to(Path.cwd())
+        resolved_relative = root.resolve().relative_to(Path.cwd())
     except ValueError:
-        return skill_md.as_posix()
-    return f"/{relative.as_posix()}"
+        return lambda skill_md: skill_md.as_posix()
+    prefix = "" if resolved_relative == Path() else f"/{resolved_relative.as_posix()}"
+    return lambda skill_md: f"{prefix}/{skill_md.relative_to(root).as_posix()}"
 
 
-def _resolve_skill_path(skill_md: Path, root: Path, virtual_root: str | None) -> str:
-    if virtual_root:
-        relative = skill_md.relative_to(root)
-        return f"{virtual_root}/{relative.as_posix()}"
-    return _default_virtual_path(skill_md)
+def _tree_signature(root_path: Path) -> tuple[int, int]:
+    """Stat every directory `_iter_skill_files` visits and every SKILL.md in them.
+
+    Returns `(newest mtime, hash of every SKILL.md (path, mtime) pair)`. The hash
+    changes when a skill at any depth is added, removed or edited; the newest
+    mtime also covers directory changes, for judging skills.json freshness.
+    Nothing is read, so this stays far cheaper than a rescan.
+    """
+    newest = 0
+    stamps: list[tuple[str, int]] = []
+    stack = [str(root_path)]
+    while stack:
+        current = stack.pop()
+        try:
+            mtime = os.stat(current).st_mtime_ns
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        newest = max(newest, mtime)
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in DEFAULT_SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name == SKILL_FILENAME:
+                    mtime = entry.stat().st_mtime_ns
+                    newest = max(newest, mtime)
+                    stamps.append((entry.path, mtime))
+            except OSError:
+                continue
+    return newest, hash(tuple(stamps))
+
+
+def _read_skill(skill_md: Path, file_path: str) -> SkillMetadata | None:
+    try:
+        raw = _read_frontmatter_text(skill_md)
+    except OSError:
+        return None
+    meta = _parse_frontmatter(raw)
+    name = str(meta.get("name") or skill_md.parent.name).strip()
+    description = str(meta.get("description") or "").strip()
+    allowed_tools = meta.get("allowed-tools") or meta.get("allowed_tools")
+    if isinstance(allowed_tools, (list, tuple)):
+        allowed_tools = tuple(str(tool) for tool in allowed_tools)
+    else:
+        allowed_tools = None
+    return SkillMetadata(
+        name=name,
+        description=description,
+        file_path=file_path,
+        allowed_tools=allowed_tools,
+    )
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=_MAX_READ_WORKERS, thread_name_prefix="skills-scan")
+    return _EXECUTOR
+
+
+def _scan_root(root_path: Path, virtual_root: str | None) -> list[SkillMetadata]:
+    return _read_skills(root_path, _skill_path_resolver(root_path, virtual_root))
+
+
+def _read_skills(root_path: Path, to_file_path: Callable[[Path], str]) -> list[SkillMetadata]:
+    skill_files = list(_iter_skill_files(root_path))
+    if len(skill_files) <= 1:
+        results = [_read_skill(skill_md, to_file_path(skill_md)) for skill_md in skill_files]
+    else:
+        results = list(_get_executor().map(lambda skill_md: _read_skill(skill_md, to_file_path(skill_md)), skill_files))
+    return [skill for skill in results if skill is not None]
+
+
+def write_skills_index(root: str | Path) -> Path:
+    """Scan `root` and write its skills to `root/skills.json`.
+
+    `file_path` entries are stored relative to `root` so the index stays valid
+    wherever the directory is mounted; they are mapped to virtual paths on load.
+    """
+    root_path = Path(root).expanduser()
+    skills = _read_skills(root_path, lambda skill_md: skill_md.relative_to(root_path).as_posix())
+    skills.sort(key=lambda skill: skill.name.lower())
+    entries = [
+        {
+            "name": skill.name,
+            "description": skill.description,
+            "file_path": skill.file_path,
+            "allowed_tools": list(skill.allowed_tools) if skill.allowed_tools is not None else None,
+        }
+        for skill in skills
+    ]
+    index_path = root_path / SKILLS_INDEX_FILENAME
+    index_path.write_text(json.dumps(entries, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return index_path
+
+
+def list_skills_from_index(index_path: str | Path, virtual_root: str | None = None) -> List[SkillMetadata]:
+    """Load skills from a `skills.json` index written by `write_skills_index`."""
+    index_path = Path(index_path).expanduser()
+    root_path = index_path.parent
+    normalized_virtual_root = _normalize_virtual_root(virtual_root) if virtual_root else None
+    entries = json.loads(index_path.read_text(encoding="utf-8"))
+    to_file_path = _skill_path_resolver(root_path, normalized_virtual_root)
+    return [
+        SkillMetadata(
+            name=entry["name"],
+            description=entry.get("description") or "",
+            file_path=to_file_path(root_path / entry["file_path"]),
+            allowed_tools=tuple(entry["allowed_tools"]) if entry.get("allowed_tools") is not None else None,
+        )
+        for entry in entries
+    ]
+
+
+def _fresh_index_mtime(root_path: Path, tree_mtime: int) -> int | None:
+    """Return the skills.json mtime if it is at least `tree_mtime`, the newest mtime
+    from `_tree_signature` (so nested skills count), else None."""
+    try:
+        index_mtime = (root_path / SKILLS_INDEX_FILENAME).stat().st_mtime_ns
+    except OSError:
+        return None
+    return index_mtime if index_mtime >= tree_mtime else None
 
 
 def normalize_skills_dirs(
@@ -76,26 +293,31 @@ def list_skills(
         if not root_path.exists() or not root_path.is_dir():
             continue
         normalized_virtual_root = _normalize_virtual_root(virtual_root) if virtual_root else None
-        for skill_md in root_path.rglob("SKILL.md"):
+        cache_key = (
+            str(root_path.resolve()),
+            normalized_virtual_root,
+            None if normalized_virtual_root else os.getcwd(),
+        )
+        tree_signature = _tree_signature(root_path)
+        index_mtime = _fresh_index_mtime(root_path, tree_signature[0])
+        signature = (tree_signature, index_mtime)
+        cached = _SKILLS_CACHE.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            out.extend(cached[1])
+            continue
+        skills = None
+        if index_mtime is not None:
             try:
-                raw = skill_md.read_text(encoding="utf-8", errors="replace")
-            except OSError:
-                continue
-            meta = _parse_frontmatter(raw)
-            name = str(meta.get("name") or skill_md.parent.name).strip()
-            description = str(meta.get("description") or "").strip()
-            allowed_tools = meta.get("allowed-tools") or meta.get("allowed_tools")
-            if isinstance(allowed_tools, (list, tuple)):
-                allowed_tools = [str(tool) for tool in allowed_tools]
-            else:
-                allowed_tools = None
-            out.append(
-                SkillMetadata(
-                    name=name,
-                    description=description,
-                    file_path=_resolve_skill_path(skill_md, root_path, normalized_virtual_root),
-                    allowed_tools=allowed_tools,
-                )
-            )
+                skills = list_skills_from_index(root_path / SKILLS_INDEX_FILENAME, normalized_virtual_root)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                # A hand-edited or unrelated skills.json is ignored, not fatal.
+                skills = None
+        if skills is None:
+            skills = _scan_root(root_path, normalized_virtual_root)
+        _SKILLS_CACHE[cache_key] = (signature, skills)
+        out.extend(skills)
     out.sort(key=lambda skill: skill.name.lower())
     return out
+
+
+list_skills.cache_clear = _SKILLS_CACHE.clear  # type: ignore[attr-defined]
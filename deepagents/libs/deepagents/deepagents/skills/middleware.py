@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable, Sequence
-from dataclasses import asdict
 from pathlib import Path
 from typing import Any
 
@@ -9,34 +11,79 @@ from langchain.agents.middleware.types import AgentMiddleware, AgentState, Model
 from typing_extensions import NotRequired
 
 from deepagents.skills.load import list_skills, normalize_skills_dirs
+from deepagents.skills.types import SkillMetadata
 
 SKILLS_STATE_KEY = "skills_metadata"
+_RENDER_CACHE_SIZE = 32
+_PROMPT_CACHE_SIZE = 8
+# Shared by every middleware instance; abefore_agent renders on worker threads.
+_RENDER_CACHE: OrderedDict[tuple[tuple[Any, Any, Any], ...], str] = OrderedDict()
+_RENDER_CACHE_LOCK = threading.Lock()
+_SKILLS_PROMPT_HEADER = (
+    "You have access to a set of optional Skills.\n"
+    "Skills are folders containing a SKILL.md file.\n"
+    "Only the metadata is loaded by default. If a skill seems relevant, read its SKILL.md using filesystem tools.\n"
+    "\n"
+    "Available skills:"
+)
 
 
 class SkillsState(AgentState):
     skills_metadata: NotRequired[list[dict[str, Any]]]
+    skills_metadata_block: NotRequired[str]
+
+
+def _skill_to_dict(skill: SkillMetadata) -> dict[str, Any]:
+    # Built fresh per call: the dict goes straight into agent state, where
+    # callers may mutate it, so it must not be shared between runs.
+    return {
+        "name": skill.name,
+        "description": skill.description,
+        "file_path": skill.file_path,
+        "allowed_tools": list(skill.allowed_tools) if skill.allowed_tools is not None else None,
+    }
+
+
+def _truncate_description(description: str, limit: int) -> str:
+    if limit <= 3:
+        return description[:limit]
+    return description[: limit - 3].rstrip() + "..."
 
 
 def render_skills_system_prompt(skills: Sequence[dict[str, Any]]) -> str:
     if not skills:
         return ""
-    lines = [
-        "You have access to a set of optional Skills.",
-        "Skills are folders containing a SKILL.md file.",
-        "Only the metadata is loaded by default. If a skill seems relevant, read its SKILL.md using filesystem tools.",
-        "",
-        "Available skills:",
-    ]
-    for skill in skills:
-        name = str(skill.get("name") or "").strip()
-        description = str(skill.get("description") or "").strip()
-        path = str(skill.get("file_path") or "").strip()
-        if name:
-            if description:
-                lines.append(f"- {name}: {description} (read {path})")
-            else:
-                lines.append(f"- {name}: (read {path})")
-    return "\n".join(lines).strip()
+    key = tuple((skill["name"], skill.get("description"), skill["file_path"]) for skill in skills)
+    with _RENDER_CACHE_LOCK:
+        cached = _RENDER_CACHE.get(key)
+    if cached is not None:
+        return cached
+    rendered = _render_skills_system_prompt(skills)
+    with _RENDER_CACHE_LOCK:
+        # Another thread may have rendered the same skills meanwhile; keep its
+        # string so repeated calls still return one shared object.
+        cached = _RENDER_CACHE.setdefault(key, rendered)
+        if len(_RENDER_CACHE) > _RENDER_CACHE_SIZE:
+            _RENDER_CACHE.popitem(last=False)
+    return cached
+
+
+def _render_skill_line(skill: dict[str, Any]) -> str | None:
+    # Values come from SkillMetadata, which _read_skill stores already stripped.
+    # Descriptions are omitted entirely when the middleware runs with lazy_descriptions.
+    name = skill["name"]
+    if not name:
+        return None
+    description = skill.get("description")
+    path = skill["file_path"]
+    if description:
+        return f"- {name}: {description} (read {path})"
+    return f"- {name}: (read {path})"
+
+
+def _render_skills_system_prompt(skills: Sequence[dict[str, Any]]) -> str:
+    body = "\n".join(line for line in map(_render_skill_line, skills) if line is not None)
+    return f"{_SKILLS_PROMPT_HEADER}\n{body}" if body else _SKILLS_PROMPT_HEADER
 
 
 class SkillsMiddleware(AgentMiddleware):
@@ -47,40 +94,77 @@ class SkillsMiddleware(AgentMiddleware):
         *,
         skills_dirs: Sequence[str | Path | tuple[str | Path, str]] | str | Path,
         state_key: str = SKILLS_STATE_KEY,
+        description_max_chars: int | None = 160,
+        lazy_descriptions: bool = False,
     ) -> None:
         self.skills_dirs = normalize_skills_dirs(skills_dirs)
         self.state_key = state_key
+        # Descriptions cost prompt tokens on every turn; the agent can read SKILL.md for the rest.
+        self.description_max_chars = description_max_chars
+        self.lazy_descriptions = lazy_descriptions
+        self.block_key = f"{state_key}_block"
         self.tools = []
+        # Checked once: with no existing skills directory the middleware is a no-op.
+        self._enabled = any(
+            Path(root[0] if isinstance(root, tuple) else root).expanduser().is_dir() for root in self.skills_dirs
+        )
+        # (system prompt, skills block) -> combined prompt, most recently used last.
+        self._prompt_cache: OrderedDict[tuple[str | None, str], str] = OrderedDict()
+
+    def _inject_skills(self, request: ModelRequest) -> ModelRequest:
+        block = request.state.get(self.block_key)
+        if block is None:
+            # State written before the block was precomputed (e.g. an older checkpoint).
+            block = render_skills_system_prompt(request.state.get(self.state_key, []))
+        if not block:
+            return request
+        system_prompt = request.system_prompt
+        key = (system_prompt, block)
+        updated = self._prompt_cache.get(key)
+        if updated is None:
+            updated = f"{system_prompt}\n\n{block}" if system_prompt else block
+            self._prompt_cache[key] = updated
+            if len(self._prompt_cache) > _PROMPT_CACHE_SIZE:
+                self._prompt_cache.popitem(last=False)
+        else:
+            self._prompt_cache.move_to_end(key)
+        return request.override(system_prompt=updated)
+
+    def _state_entry(self, skill: SkillMetadata) -> dict[str, Any]:
+        if self.lazy_descriptions:
+            return {"name": skill.name, "file_path": skill.file_path}
+        entry = _skill_to_dict(skill)
+        limit = self.description_max_chars
+        if limit is not None and len(skill.description) > limit:
+            entry["description"] = _truncate_description(skill.description, limit)
+        return entry
 
     def before_agent(self, state: dict[str, Any], runtime: Any) -> dict[str, Any]:
-        skills = list_skills(self.skills_dirs)
-        return {self.state_key: [asdict(skill) for skill in skills]}
+        if not self._enabled:
+            return {}
+        skills = [self._state_entry(skill) for skill in list_skills(self.skills_dirs)]
+        return {self.state_key: skills, self.block_key: render_skills_system_prompt(skills)}
 
     async def abefore_agent(self, state: dict[str, Any], runtime: Any) -> dict[str, Any]:
-        return self.before_agent(state, runtime)
+        if not self._enabled:
+            return {}
+        # Discovery touches the filesystem; keep it off the event loop.
+        return await asyncio.to_thread(self.before_agent, state, runtime)
 
     def wrap_model_call(
         self,
         request: ModelRequest,
         handler: Callable[[ModelRequest], ModelResponse],
     ) -> ModelResponse:
-        skills = request.state.get(self.state_key, [])
-        block = render_skills_system_prompt(skills)
-        if block:
-            system_prompt = request.system_prompt
-            updated = f"{system_prompt}\n\n{block}" if system_prompt else block
-            request = request.override(system_prompt=updated)
-        return handler(request)
+        if not self._enabled:
+            return handler(request)
+        return handler(self._inject_skills(request))
 
     async def awrap_model_call(
         self,
         request: ModelRequest,
         handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
     ) -> ModelResponse:
-        skills = request.state.get(self.state_key, [])
-        block = render_skills_system_prompt(skills)
-        if block:
-            system_prompt = request.system_prompt
-            updated = f"{system_prompt}\n\n{block}" if system_prompt else block
-            request = request.override(system_prompt=updated)
-        return await handler(request)
+        if not self._enabled:
+            return await handler(request)
+        return await handler(self._inject_skills(request))
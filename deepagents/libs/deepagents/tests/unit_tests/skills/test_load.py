@@ -0,0 +1,191 @@
+"""Unit tests for directory-based skill discovery in deepagents.skills.load."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+import yaml
+
+from deepagents.skills.load import _parse_frontmatter, list_skills, write_skills_index
+
+
+def make_skill(skills_dir: Path, dirname: str, frontmatter: str) -> Path:
+    """Create `<skills_dir>/<dirname>/SKILL.md` with the given frontmatter body."""
+    skill_dir = skills_dir / dirname
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    skill_md = skill_dir / "SKILL.md"
+    skill_md.write_text(f"---\n{frontmatter}\n---\n\n# {dirname}\n", encoding="utf-8")
+    return skill_md
+
+
+@pytest.fixture(autouse=True)
+def clear_skills_cache() -> None:
+    """Start every test with an empty discovery cache."""
+    list_skills.cache_clear()
+
+
+def test_list_skills_with_virtual_root(tmp_path: Path) -> None:
+    """Skills are discovered recursively and mapped under the virtual root."""
+    make_skill(tmp_path, "web-research", "name: web-research\ndescription: Research the web\nallowed-tools: [read_file]")
+    make_skill(tmp_path / "group", "docs", "description: Write docs")
+
+    skills = list_skills([(tmp_path, "/skills")])
+
+    assert [skill.name for skill in skills] == ["docs", "web-research"]
+    assert skills[0].file_path == "/skills/group/docs/SKILL.md"
+    assert skills[1].description == "Research the web"
+    assert list(skills[1].allowed_tools) == ["read_file"]
+
+
+def test_list_skills_skips_missing_root(tmp_path: Path) -> None:
+    """Nonexistent roots contribute no skills."""
+    assert list_skills(tmp_path / "missing") == []
+
+
+def test_list_skills_reuses_cache_until_root_changes(tmp_path: Path) -> None:
+    """Unchanged roots are served from the cache; edited SKILL.md files invalidate it."""
+    skill_md = make_skill(tmp_path, "alpha", "name: alpha\ndescription: old")
+    assert list_skills(tmp_path)[0].description == "old"
+
+    # Same size, same mtime: the cached metadata is returned without re-reading.
+    stat = skill_md.stat()
+    skill_md.write_text(skill_md.read_text(encoding="utf-8").replace("old", "new"), encoding="utf-8")
+    os.utime(skill_md, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.utime(tmp_path / "alpha", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert list_skills(tmp_path)[0].description == "old"
+
+    os.utime(skill_md, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert list_skills(tmp_path)[0].description == "new"
+
+
+def test_list_skills_cache_tracks_nested_skills(tmp_path: Path) -> None:
+    """Edits and additions below the first directory level invalidate the cache."""
+    skill_md = make_skill(tmp_path / "group", "docs", "name: docs\ndescription: old")
+    assert list_skills(tmp_path)[0].description == "old"
+
+    stat = skill_md.stat()
+    skill_md.write_text(skill_md.read_text(encoding="utf-8").replace("old", "new"), encoding="utf-8")
+    os.utime(skill_md, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert list_skills(tmp_path)[0].description == "new"
+
+    make_skill(tmp_path / "group" / "deeper", "nested", "name: nested")
+    assert [skill.name for skill in list_skills(tmp_path)] == ["docs", "nested"]
+
+
+def test_list_skills_prunes_skip_dirs(tmp_path: Path) -> None:
+    """SKILL.md files under vendored or cache directories are ignored."""
+    make_skill(tmp_path, "real", "name: real")
+    make_skill(tmp_path / "node_modules", "vendored", "name: vendored")
+    make_skill(tmp_path / ".git", "internal", "name: internal")
+
+    assert [skill.name for skill in list_skills(tmp_path)] == ["real"]
+
+
+def test_list_skills_reads_frontmatter_longer_than_head(tmp_path: Path) -> None:
+    """Frontmatter that does not fit in the head read is still parsed in full."""
+    description = "x" * 6000
+    make_skill(tmp_path, "long", f"name: long\ndescription: {description}")
+
+    assert list_skills(tmp_path)[0].description == description
+
+
+def test_list_skills_prefers_fresh_index(tmp_path: Path) -> None:
+    """A skills.json newer than the tree is loaded instead of scanning SKILL.md files."""
+    skill_md = make_skill(tmp_path, "alpha", "name: alpha\ndescription: from frontmatter")
+    index_path = write_skills_index(tmp_path)
+    entries = json.loads(index_path.read_text(encoding="utf-8"))
+    assert entries == [{"name": "alpha", "description": "from frontmatter", "file_path": "alpha/SKILL.md", "allowed_tools": None}]
+
+    entries[0]["description"] = "from index"
+    index_path.write_text(json.dumps(entries), encoding="utf-8")
+    skills = list_skills([(tmp_path, "/skills")])
+    assert skills[0].description == "from index"
+    assert skills[0].file_path == "/skills/alpha/SKILL.md"
+
+    # Editing a skill after the index was built makes the index stale.
+    index_mtime = index_path.stat().st_mtime_ns
+    os.utime(skill_md, ns=(index_mtime, index_mtime + 1_000_000_000))
+    assert list_skills([(tmp_path, "/skills")])[0].description == "from frontmatter"
+
+
+def test_list_skills_index_goes_stale_on_nested_edit(tmp_path: Path) -> None:
+    """Editing a nested SKILL.md after the index was built makes the index stale."""
+    skill_md = make_skill(tmp_path / "group", "docs", "name: docs\ndescription: from frontmatter")
+    index_path = write_skills_index(tmp_path)
+    entries = json.loads(index_path.read_text(encoding="utf-8"))
+    entries[0]["description"] = "from index"
+    index_path.write_text(json.dumps(entries), encoding="utf-8")
+    assert list_skills(tmp_path)[0].description == "from index"
+
+    index_mtime = index_path.stat().st_mtime_ns
+    os.utime(skill_md, ns=(index_mtime, index_mtime + 1_000_000_000))
+    assert list_skills(tmp_path)[0].description == "from frontmatter"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '[{"name": "alpha", "desc',
+        '{"name": "alpha"}',
+        '[{"description": "no name"}]',
+        '["alpha"]',
+        '[{"name": "alpha", "file_path": 7}]',
+    ],
+)
+def test_list_skills_falls_back_to_scan_on_malformed_index(tmp_path: Path, content: str) -> None:
+    """A fresh but malformed skills.json is ignored and the tree is scanned instead."""
+    make_skill(tmp_path, "alpha", "name: alpha\ndescription: from frontmatter")
+    index_path = tmp_path / "skills.json"
+    index_path.write_text(content, encoding="utf-8")
+    newest = max(path.stat().st_mtime_ns for path in tmp_path.rglob("*"))
+    os.utime(index_path, ns=(newest, newest + 1_000_000_000))
+
+    skills = list_skills(tmp_path)
+
+    assert [(skill.name, skill.description) for skill in skills] == [("alpha", "from frontmatter")]
+
+
+@pytest.mark.parametrize(
+    "block",
+    [
+        "name: pdf\ndescription: Extract text, tables and forms (e.g. invoices).",
+        "name: pdf\nallowed-tools: [read_file, write_file]",
+        "name: 'quoted'\ndescription: >\n  folded\n  text",
+        "name: yes\ndescription: 2024 release notes",
+    ],
+)
+def test_parse_frontmatter_matches_yaml(block: str) -> None:
+    """The flat-frontmatter fast path agrees with a full YAML parse."""
+    assert _parse_frontmatter(f"---\n{block}\n---\n") == yaml.safe_load(block)
+
+
+@pytest.mark.parametrize("block", ["description: ends:", "name: =", "name: <<", "name: trailing colon:"])
+def test_parse_frontmatter_rejects_what_yaml_rejects(block: str) -> None:
+    """Values YAML cannot load fall through to the YAML parser and are skipped."""
+    with pytest.raises(yaml.YAMLError):
+        yaml.safe_load(block)
+    assert _parse_frontmatter(f"---\n{block}\n---\n") == {}
+
+
+def test_parse_frontmatter_requires_exact_delimiters() -> None:
+    """Only bare `---` lines delimit frontmatter; CRLF files are supported."""
+    assert _parse_frontmatter("---\r\nname: crlf\r\n---\r\nbody") == {"name": "crlf"}
+    assert _parse_frontmatter("---\nname: a\n----\nbody\n") == {}
+    assert _parse_frontmatter("name: a\n---\n") == {}
+
+
+def test_list_skills_default_paths_are_cwd_relative(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without a virtual root, paths are shown relative to the working directory."""
+    make_skill(tmp_path / "skills", "alpha", "name: alpha")
+    monkeypatch.chdir(tmp_path)
+
+    assert list_skills("skills")[0].file_path == "/skills/alpha/SKILL.md"
+    assert list_skills(".")[0].file_path == "/skills/alpha/SKILL.md"
+
+
+def test_list_skills_decodes_non_ascii_frontmatter(tmp_path: Path) -> None:
+    """Non-ASCII frontmatter is decoded as UTF-8."""
+    make_skill(tmp_path, "docs", "name: docs\ndescription: Résumé des documents 文档")
+
+    assert list_skills(tmp_path)[0].description == "Résumé des documents 文档"
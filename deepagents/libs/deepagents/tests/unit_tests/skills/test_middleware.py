@@ -0,0 +1,111 @@
+"""Unit tests for the directory-based SkillsMiddleware in deepagents.skills.middleware."""
+
+from pathlib import Path
+
+import pytest
+from langchain.agents.middleware.types import ModelRequest
+
+from deepagents.skills.load import list_skills
+from deepagents.skills.middleware import SKILLS_STATE_KEY, SkillsMiddleware, render_skills_system_prompt
+
+
+@pytest.fixture(autouse=True)
+def clear_skills_cache() -> None:
+    """Start every test with an empty discovery cache."""
+    list_skills.cache_clear()
+
+
+def make_skill(skills_dir: Path, name: str, description: str) -> None:
+    """Create `<skills_dir>/<name>/SKILL.md` with name and description frontmatter."""
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {description}\n---\n", encoding="utf-8")
+
+
+def test_render_skills_system_prompt() -> None:
+    """Each named skill renders as one bullet; unnamed entries are skipped."""
+    skills = [
+        {"name": "alpha", "description": "First", "file_path": "/skills/alpha/SKILL.md"},
+        {"name": "beta", "description": "", "file_path": "/skills/beta/SKILL.md"},
+    ]
+
+    block = render_skills_system_prompt(skills)
+
+    assert block.startswith("You have access to a set of optional Skills.")
+    assert block.endswith("- alpha: First (read /skills/alpha/SKILL.md)\n- beta: (read /skills/beta/SKILL.md)")
+    assert render_skills_system_prompt(skills) is block
+    assert render_skills_system_prompt([]) == ""
+
+
+def test_before_agent_stores_skill_dicts(tmp_path: Path) -> None:
+    """before_agent loads skill metadata into state as plain dicts."""
+    make_skill(tmp_path, "alpha", "First")
+    middleware = SkillsMiddleware(skills_dirs=[(tmp_path, "/skills")])
+
+    update = middleware.before_agent({}, None)
+
+    assert update[SKILLS_STATE_KEY] == [
+        {"name": "alpha", "description": "First", "file_path": "/skills/alpha/SKILL.md", "allowed_tools": None},
+    ]
+    assert update[f"{SKILLS_STATE_KEY}_block"] == render_skills_system_prompt(update[SKILLS_STATE_KEY])
+
+
+def test_before_agent_returns_independent_skill_dicts(tmp_path: Path) -> None:
+    """Mutating one run's skill entries does not leak into later runs."""
+    make_skill(tmp_path, "alpha", "First")
+    middleware = SkillsMiddleware(skills_dirs=[(tmp_path, "/skills")])
+
+    first = middleware.before_agent({}, None)[SKILLS_STATE_KEY]
+    first[0]["description"] = "mutated"
+
+    assert middleware.before_agent({}, None)[SKILLS_STATE_KEY][0]["description"] == "First"
+
+
+def test_wrap_model_call_appends_skills_block(tmp_path: Path) -> None:
+    """The rendered skills block is appended to the system prompt and reused across calls."""
+    make_skill(tmp_path, "alpha", "First")
+    middleware = SkillsMiddleware(skills_dirs=[(tmp_path, "/skills")])
+    state = middleware.before_agent({}, None)
+    seen: list[str] = []
+
+    def handler(request: ModelRequest) -> str:
+        seen.append(request.system_prompt)
+        return "ok"
+
+    request = ModelRequest(model=None, messages=[], system_prompt="Base prompt", state=state)
+    middleware.wrap_model_call(request, handler)
+    middleware.wrap_model_call(request, handler)
+
+    assert seen[0].startswith("Base prompt\n\nYou have access to a set of optional Skills.")
+    assert seen[0].endswith("- alpha: First (read /skills/alpha/SKILL.md)")
+    assert seen[1] == seen[0]
+    assert len(middleware._prompt_cache) == 1
+
+
+def test_middleware_is_noop_without_skills_dirs(tmp_path: Path) -> None:
+    """Missing skills directories disable state updates and prompt injection."""
+    middleware = SkillsMiddleware(skills_dirs=[tmp_path / "missing"])
+    request = ModelRequest(model=None, messages=[], system_prompt="Base prompt", state={})
+
+    assert middleware.before_agent({}, None) == {}
+    assert middleware.wrap_model_call(request, lambda req: req) is request
+
+
+def test_before_agent_truncates_and_omits_descriptions(tmp_path: Path) -> None:
+    """Long descriptions are truncated; lazy_descriptions keeps only name and path."""
+    make_skill(tmp_path, "alpha", "word " * 100)
+
+    truncated = SkillsMiddleware(skills_dirs=tmp_path, description_max_chars=20).before_agent({}, None)
+    assert truncated[SKILLS_STATE_KEY][0]["description"] == "word word word wo..."
+
+    lazy = SkillsMiddleware(skills_dirs=[(tmp_path, "/skills")], lazy_descriptions=True).before_agent({}, None)
+    assert lazy[SKILLS_STATE_KEY] == [{"name": "alpha", "file_path": "/skills/alpha/SKILL.md"}]
+    assert lazy[f"{SKILLS_STATE_KEY}_block"].endswith("- alpha: (read /skills/alpha/SKILL.md)")
+
+
+async def test_abefore_agent_matches_before_agent(tmp_path: Path) -> None:
+    """The async hook returns the same update as the sync one."""
+    make_skill(tmp_path, "alpha", "First")
+    middleware = SkillsMiddleware(skills_dirs=[(tmp_path, "/skills")])
+
+    assert await middleware.abefore_agent({}, None) == middleware.before_agent({}, None)
@@ -1,17 +1,16 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Sequence
 
-from deepagents import create_deep_agent
-from deepagents.backends import CompositeBackend, StateBackend, FilesystemBackend
-from langchain_openai import ChatOpenAI
-
 from smartagent.tools import ALL_TOOLS, think_tool
 from smartagent.prompts import (
     ORCHESTRATOR_SYSTEM_PROMPT,
     ORCHESTRATOR_SANDBOX_SYSTEM_PROMPT,
+    ORCHESTRATOR_SANDBOX_PROMPT,
+    ORCHESTRATOR_SANDBOX_PROMPT_SHA256,
     DELEGATION_INSTRUCTIONS,
     TRANSCRIPT_POSTPROCESSOR_INSTRUCTIONS,
     current_date,
@@ -25,8 +24,51 @@ transcription_processing_agent = {
 }
 
 
+@lru_cache(maxsize=None)
+def _enable_llm_cache() -> None:
+    """Install a process-wide SQLite LLM cache unless DEEP_SCHOLAR_LLM_CACHE=0.
+
+    Cache hits replay the stored completion for an identical prompt, so this is
+    only faithful for deterministic (temperature=0) calls; with the default
+    temperature of 0.2 it trades sampling variety for speed during development.
+    """
+    if os.getenv("DEEP_SCHOLAR_LLM_CACHE", "1") != "1":
+        return
+
+    from langchain_community.cache import SQLiteCache
+    from langchain_core.globals import set_llm_cache
+
+    set_llm_cache(
+        SQLiteCache(database_path=os.getenv("DEEP_SCHOLAR_LLM_CACHE_PATH", ".langchain_cache.db"))
+    )
+
+
+def _prompt_cache_body(env_prefix: str) -> dict | None:
+    """Request body extras that let a provider reuse the static prompt prefix.
+
+    Off by default: ``prompt_cache_key`` is an OpenAI field and strict
+    OpenAI-compatible servers may reject unknown ones. Set
+    ``<PROVIDER>_PROMPT_CACHE=1`` (e.g. IFLOW_PROMPT_CACHE) for a provider that
+    accepts it. The default key embeds the prompt's content hash, so editing the
+    prompt starts a fresh cache; DEEP_SCHOLAR_PROMPT_CACHE_KEY overrides it.
+    Anthropic models are covered separately by the
+    AnthropicPromptCachingMiddleware that create_deep_agent installs.
+    """
+    if os.getenv(f"{env_prefix}_PROMPT_CACHE", "0") != "1":
+        return None
+    key = os.getenv(
+        "DEEP_SCHOLAR_PROMPT_CACHE_KEY",
+        f"deep_scholar_orchestrator_{ORCHESTRATOR_SANDBOX_PROMPT_SHA256[:12]}",
+    )
+    return {"prompt_cache_key": key} if key else None
+
+
 def build_model():
     """Pick the default LLM based on environment-driven provider selection."""
+    from langchain_openai import ChatOpenAI
+
+    _enable_llm_cache()
+
     provider = (os.getenv("DEEP_SCHOLAR_LLM_PROVIDER") or "iflow").lower()
 
     if provider == "deepseek":
@@ -35,6 +77,7 @@ def build_model():
             api_key=os.getenv("DEEPSEEK_API_KEY"),
             model=os.getenv("DEEPSEEK_MODEL", "deepseek-chat"),
             temperature=float(os.getenv("DEEPSEEK_TEMPERATURE", "0.2")),
+            extra_body=_prompt_cache_body("DEEPSEEK"),
         )
 
     if provider == "llama":
@@ -43,6 +86,7 @@ def build_model():
             api_key=os.getenv("LLAMA_API_KEY"),
             model=os.getenv("LLAMA_MODEL", "llama3"),
             temperature=float(os.getenv("LLAMA_TEMPERATURE", "0.2")),
+            extra_body=_prompt_cache_body("LLAMA"),
         )
 
     # Default: IFlow (qwen3-max)
@@ -51,6 +95,7 @@ def build_model():
         api_key=os.getenv("IFLOW_API_KEY"),
         model=os.getenv("IFLOW_MODEL", "qwen3-max"),
         temperature=float(os.getenv("IFLOW_TEMPERATURE", "0.2")),
+        extra_body=_prompt_cache_body("IFLOW"),
     )
 
 
@@ -59,13 +104,15 @@ def build_agent(
     composite_backend,
     skills_dirs: Sequence[str | Path | tuple[str | Path, str]] | str | Path | None = None,
 ):
+    from deepagents import create_deep_agent
+
     model = build_model()
 
     return create_deep_agent(
         model=model,
         tools=ALL_TOOLS,
         # system_prompt=ORCHESTRATOR_SYSTEM_PROMPT + DELEGATION_INSTRUCTIONS,
-        system_prompt = ORCHESTRATOR_SANDBOX_SYSTEM_PROMPT + DELEGATION_INSTRUCTIONS,
+        system_prompt=ORCHESTRATOR_SANDBOX_PROMPT,
         subagents=[transcription_processing_agent],
         backend=composite_backend,
         skills_dirs=skills_dirs,
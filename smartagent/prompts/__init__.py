@@ -1,4 +1,17 @@
-from .orchestrator import ORCHESTRATOR_SYSTEM_PROMPT
+import hashlib
+
+from .orchestrator import (
+    ORCHESTRATOR_CORE_PROMPT,
+    ORCHESTRATOR_SYSTEM_PROMPT,
+    ORCHESTRATOR_SYSTEM_PROMPT_SHA256,
+    ORCHESTRATOR_WORKSPACE_PROMPT,
+)
 from .orchestrator_sandbox import ORCHESTRATOR_SANDBOX_SYSTEM_PROMPT
 from .delegation import DELEGATION_INSTRUCTIONS
 from .transcription import TRANSCRIPT_POSTPROCESSOR_INSTRUCTIONS, current_date
+
+# Byte-identical system prompt for every orchestrator call, composed once. Sent
+# verbatim as the cached system-prompt prefix on every turn; per-request values
+# (dates, user ids, memories) belong in later messages, never here.
+ORCHESTRATOR_SANDBOX_PROMPT = ORCHESTRATOR_SANDBOX_SYSTEM_PROMPT + "\n\n" + DELEGATION_INSTRUCTIONS
+ORCHESTRATOR_SANDBOX_PROMPT_SHA256 = hashlib.sha256(ORCHESTRATOR_SANDBOX_PROMPT.encode("utf-8")).hexdigest()
@@ -2,4 +2,4 @@ DELEGATION_INSTRUCTIONS = """
 ONLY delegate when ABSOLUTELY NECESSARY
 1. AFTER doing ASR on audio file, delegate the processing of transcribed results to transcription-processing-agent for further processing, DON'T delegate the processing of audios to subagent!
 
-"""
+""".strip()
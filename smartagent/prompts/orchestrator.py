@@ -1,15 +1,26 @@
-ORCHESTRATOR_SYSTEM_PROMPT = """
-Your job is to fullfill user's request step-by-step
+import hashlib
 
-# Rule of using different storage
-
-1. the /final_report.md /plan.md /todo-list.md /file-summary.md /plan-hierarchical.md etc. all the files as a general perspective understanding or plan must be stored in the / root level
-2. all the input files, are stored in the /workspace and therefore user's reference to user-provided files are located here
-3. If the plan involves reading many resources, you should use the root-level storage as temporary storage for your analysis results, summaries, notes, etc., and use the /workspace for user-provided files only.
-4. If intended to write enormous files, you should complete part-by-part and store them in the / root level storage, and combine them all together at the end to form the final output file. For example, if you were to write a report including 8 chapters, you should write chapter 1 to chapter 8 separately as /chapter_1.md, /chapter_2.md, ..., /chapter_8.md, and then combine them all together to form the final /final_report.md at the end, to ensure each part's comprehensiveness.
+ORCHESTRATOR_CORE_PROMPT = """
+Fulfill the user's request step by step.
 
 # IMPORTANT NOTE
 
-1. NEVER try to create or run ANY executable files, scripts, or code that can be executed in the system, you are not allowed to run any code that can be executed in the system.
-2. Do not delegate any file operations to sub-agents, all file operations must be handled by you directly using the provided tools. You can use script for batch operation if needed.
-"""
+1. NEVER create or run ANY executable file, script, or code on the system.
+2. Never delegate file operations to sub-agents; handle them yourself with the provided tools. Scripts are allowed for batch operations.
+
+# Storage rules
+
+- User-provided input files -> /workspace. Only user files live there.
+- Notes, summaries and intermediate analysis when reading many resources -> / root.
+""".strip()
+
+ORCHESTRATOR_WORKSPACE_PROMPT = """
+- Meta files (/final_report.md, /plan.md, /todo-list.md, /file-summary.md, /plan-hierarchical.md, other plans/overviews) -> / root.
+- Chunked writes: write large outputs part by part to / root (e.g. /chapter_1.md ... /chapter_8.md), then combine them into the final file (e.g. /final_report.md) so every part stays thorough.
+""".strip()
+
+# Core first: edits to the workspace hints leave the cached core prefix intact.
+# Frozen at import: stripped once here, so callers must not re-strip or mutate it.
+ORCHESTRATOR_SYSTEM_PROMPT = ORCHESTRATOR_CORE_PROMPT + "\n" + ORCHESTRATOR_WORKSPACE_PROMPT
+# Content hash for versioning downstream caches; changes with any prompt edit.
+ORCHESTRATOR_SYSTEM_PROMPT_SHA256 = hashlib.sha256(ORCHESTRATOR_SYSTEM_PROMPT.encode("utf-8")).hexdigest()
@@ -62,4 +62,4 @@ WORKFLOW EXPECTATIONS
   - If it is a plan/summary/report, it belongs in /.
 
 You must follow these rules exactly.
-"""
+""".strip()
@@ -1,16 +1,111 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
-
-from rich.console import Console
-from rich.json import JSON
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from pygments.lexer import Lexer
+from pygments.lexers import get_lexer_by_name
+from pygments.util import ClassNotFound
+from rich.console import Console, Group, RenderableType
+from rich.highlighter import JSONHighlighter
 from rich.panel import Panel
 from rich.rule import Rule
 from rich.syntax import Syntax
 from rich.text import Text
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson is not installed
+    orjson = None
+
+
+# -----------------------------
+# JSON helpers
+# -----------------------------
+
+_JSON_HIGHLIGHTER = JSONHighlighter()
+
+# Serialized JSON longer than this is highlighted fresh rather than memoized, so
+# the cache only ever pins small tool-call payloads.
+_HIGHLIGHT_CACHE_MAX_CHARS = 4096
+
+# LangGraph's Overwrite wrapper, recorded the first time one is seen so the
+# renderer never has to import langgraph.
+_OVERWRITE_CLS: Optional[type] = None
+
+_PREVIEW_TRUNCATED = "... [truncated]"
+
+# show_prompt highlighting: markdown headings (any line) and <tag>-style markers.
+_PROMPT_HEADING_RE = re.compile(r"^#+.*$", re.MULTILINE)
+_PROMPT_TAG_RE = re.compile(r"<[^>]+>")
+
+# Characters that start markdown markup; text without any is rendered as plain Text.
+_MARKDOWN_HINT_RE = re.compile(r"[#*`_\[]")
+
+
+def _dumps_pretty(data: Any) -> str:
+    """
+    Serialize to indented, non-ASCII-escaped JSON. Uses orjson when available and
+    falls back to stdlib json for values orjson rejects (e.g. ints beyond 64 bits).
+    """
+    if type(data) is dict and not data:
+        return "{}"  # tool calls without arguments
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_text(data: Any) -> Text:
+    """
+    Highlighted JSON renderable, equivalent to rich's JSON.from_data(data, indent=2)
+    but serialized with _dumps_pretty.
+    """
+    serialized = _dumps_pretty(data)
+    if len(serialized) > _HIGHLIGHT_CACHE_MAX_CHARS:
+        return _highlight_json(serialized)
+    return _highlight_json_cached(serialized)
+
+
+def _highlight_json(serialized: str) -> Text:
+    text = _JSON_HIGHLIGHTER(serialized)
+    text.no_wrap = True
+    text.overflow = None
+    return text
+
+
+# Planner loops re-emit identical tool-call payloads; the serialized text is the
+# structural key, so repeats reuse one highlighted Text. Rendering does not
+# mutate a Text, so sharing it across panels is safe.
+_highlight_json_cached = lru_cache(maxsize=256)(_highlight_json)
+
+
+_SHARED_CONSOLE: Optional[Console] = None
+
+
+def _get_console() -> Console:
+    """
+    Console shared by every renderer built without one, so terminal detection
+    runs once per process. Every renderable is styled explicitly, so Rich's
+    repr highlighter (a regex pass per print) is disabled.
+    """
+    global _SHARED_CONSOLE
+    if _SHARED_CONSOLE is None:
+        _SHARED_CONSOLE = Console(highlight=False)
+    return _SHARED_CONSOLE
+
 
 # -----------------------------
 # Configuration
@@ -61,12 +156,30 @@ class RichAgentRenderer:
         markdown_lexer: str = "markdown",
         syntax_theme: str = "monokai",
         file_preview_lines: int = 999,
+        file_preview_bytes: int = 64 * 1024,
     ) -> None:
-        self.console = console or Console()
-        self.theme = theme
+        self.console = console or _get_console()
+        self.theme = theme  # also flattens the theme fields onto the renderer
         self.markdown_lexer = markdown_lexer
         self.syntax_theme = syntax_theme
         self.file_preview_lines = file_preview_lines
+        self.file_preview_bytes = file_preview_bytes
+        self._lexer_instance: Optional[Lexer] = None
+        # Renderables queued during one public call and written with a single console.print.
+        self._buffer: List[RenderableType] = []
+        self._batch_depth = 0
+
+    @property
+    def theme(self) -> Theme:
+        return self._theme
+
+    @theme.setter
+    def theme(self, theme: Theme) -> None:
+        # Copy each field to a plain `_<field>` attribute so hot render paths
+        # do one attribute load instead of self.theme.<field>.
+        self._theme = theme
+        for f in fields(theme):
+            setattr(self, f"_{f.name}", getattr(theme, f.name))
 
     # -------------------------
     # Public API
@@ -77,8 +190,11 @@ class RichAgentRenderer:
         Render a system or orchestrator prompt in a styled panel.
         """
         text = Text(prompt_text)
-        text.highlight_regex(r"^#+.*$", style="bold magenta")
-        text.highlight_regex(r"<[^>]+>", style="bold cyan")
+        # A substring test is far cheaper than a regex pass that cannot match.
+        if "#" in prompt_text:
+            text.highlight_regex(_PROMPT_HEADING_RE, style="bold magenta")
+        if "<" in prompt_text:
+            text.highlight_regex(_PROMPT_TAG_RE, style="bold cyan")
 
         self.console.print(
             Panel(
@@ -98,18 +214,19 @@ class RichAgentRenderer:
         """
         event_type, payload = self._extract_single_kv(event)
 
-        self._divider(event_type)
+        with self._batched():
+            self._divider(event_type)
 
-        if event_type in {"PatchToolCallsMiddleware.before_agent", "model", "tools"}:
-            for msg in self._extract_messages(payload):
-                self.render_message(msg)
+            if event_type in {"PatchToolCallsMiddleware.before_agent", "model", "tools"}:
+                for msg in self._extract_messages(payload):
+                    self._render_message(msg)
 
-            if event_type == "tools":
-                self._render_files_from_payload(payload)
+                if event_type == "tools":
+                    self._render_files_from_payload(payload)
 
-        else:
-            # Unknown/middleware events: show payload in JSON form
-            self._render_system_payload(payload)
+            else:
+                # Unknown/middleware events: show payload in JSON form
+                self._render_system_payload(payload)
 
     def render_final_output(self, result: Mapping[str, Any]) -> None:
         """
@@ -118,43 +235,33 @@ class RichAgentRenderer:
         Expected shape:
             {"messages": [...], "files": {...}, ...}
         """
-        self._divider("FINAL OUTPUT")
+        with self._batched():
+            self._divider("FINAL OUTPUT")
 
-        for msg in self._extract_messages(result):
-            self.render_message(msg)
+            for msg in self._extract_messages(result):
+                self._render_message(msg)
 
-        files = self._get_payload_value(result, "files", default={}) or {}
-        if isinstance(files, Mapping) and files:
-            self._divider("FILES")
-            for path, meta in files.items():
-                self._render_file_meta(str(path), meta)
+            files = self._get_payload_value(result, "files", default={}) or {}
+            if isinstance(files, Mapping) and files:
+                self._divider("FILES")
+                for path, meta in files.items():
+                    self._render_file_meta(str(path), meta)
 
     def render_message(self, message: Any) -> None:
         """
         Render a single LangChain-style message or compatible object.
         """
-        cls_name = message.__class__.__name__
-
-        # Support common LangChain message class names
-        if cls_name == "HumanMessage":
-            self._render_text_panel(
-                text=self._format_message_content(message),
-                title=self.theme.user_title,
-                border_style=self.theme.user_style,
-            )
-            return
+        with self._batched():
+            self._render_message(message)
 
-        if cls_name == "AIMessage":
-            self._render_text_panel(
-                text=self._format_message_content(message) or "",
-                title=self.theme.assistant_title,
-                border_style=self.theme.assistant_style,
-            )
-            self._render_tool_calls_from_message(message)
-            return
+    def _render_message(self, message: Any) -> None:
+        # type() reads the class slot directly instead of the __class__ attribute.
+        cls_name = type(message).__name__
 
-        if cls_name == "ToolMessage":
-            self._render_tool_output_message(message)
+        # Support common LangChain message class names
+        handler = self._RENDERERS.get(cls_name)
+        if handler is not None:
+            handler(self, message)
             return
 
         # Fallback: render whatever we can
@@ -164,6 +271,31 @@ class RichAgentRenderer:
             border_style="white",
         )
 
+    def _render_human(self, message: Any) -> None:
+        self._render_text_panel(
+            text=self._format_message_content(message),
+            title=self._user_title,
+            border_style=self._user_style,
+        )
+
+    def _render_ai(self, message: Any) -> None:
+        self._render_text_panel(
+            text=self._format_message_content(message) or "",
+            title=self._assistant_title,
+            border_style=self._assistant_style,
+        )
+        self._render_tool_calls_from_message(message)
+
+    def _render_tool(self, message: Any) -> None:
+        self._render_tool_output_message(message)
+
+    # Message class name -> unbound handler, looked up once per message.
+    _RENDERERS = {
+        "HumanMessage": _render_human,
+        "AIMessage": _render_ai,
+        "ToolMessage": _render_tool,
+    }
+
     # -------------------------
     # Message formatting
     # -------------------------
@@ -181,36 +313,45 @@ class RichAgentRenderer:
         tool_calls_from_content = False
 
         if isinstance(content, str):
-            parts.append(content)
+            if content:
+                parts.append(content)
 
         elif isinstance(content, list):
             for item in content:
                 if not isinstance(item, dict):
-                    parts.append(str(item))
+                    text = str(item)
+                    if text:
+                        parts.append(text)
                     continue
 
                 item_type = item.get("type")
                 if item_type == "text":
-                    parts.append(str(item.get("text", "")))
+                    text = str(item.get("text", ""))
+                    if text:
+                        parts.append(text)
                 elif item_type in {"tool_use", "tool_call"}:
                     tool_calls_from_content = True
                     name = item.get("name", "unknown_tool")
                     tool_input = item.get("input", item.get("args", {}))
                     call_id = item.get("id", "N/A")
-                    parts.append(f"[{self.theme.tool_call_title}] {name}")
-                    parts.append(json.dumps(tool_input, indent=2, ensure_ascii=False))
+                    parts.append(f"[{self._tool_call_title}] {name}")
+                    parts.append(_dumps_pretty(tool_input))
                     parts.append(f"id: {call_id}")
                 else:
                     parts.append(str(item))
 
         else:
-            parts.append(str(content))
+            text = str(content)
+            if text:
+                parts.append(text)
 
         # If tool calls were not embedded in content blocks, also check tool_calls attribute
         if not tool_calls_from_content:
             self._append_tool_calls_attribute(parts, message)
 
-        return "\n".join(p for p in parts if p is not None and p != "")
+        # Empty parts are never appended, so one join suffices; for a single
+        # part (plain-string content) join returns that string as-is.
+        return "\n".join(parts)
 
     def _append_tool_calls_attribute(self, parts: List[str], message: Any) -> None:
         tool_calls = getattr(message, "tool_calls", None)
@@ -222,8 +363,8 @@ class RichAgentRenderer:
             for call in tool_calls:
                 if not isinstance(call, Mapping):
                     continue
-                parts.append(f"[{self.theme.tool_call_title}] {call.get('name', 'unknown_tool')}")
-                parts.append(json.dumps(call.get("args", {}), indent=2, ensure_ascii=False))
+                parts.append(f"[{self._tool_call_title}] {call.get('name', 'unknown_tool')}")
+                parts.append(_dumps_pretty(call.get("args", {})))
                 parts.append(f"id: {call.get('id', 'N/A')}")
 
     def _render_tool_calls_from_message(self, message: Any) -> None:
@@ -240,8 +381,8 @@ class RichAgentRenderer:
 
             self._render_json_panel(
                 data={"name": name, "args": args, "id": call_id},
-                title=f"{self.theme.tool_call_title} — {name}",
-                border_style=self.theme.tool_call_style,
+                title=f"{self._tool_call_title} — {name}",
+                border_style=self._tool_call_style,
             )
 
     def _render_tool_output_message(self, message: Any) -> None:
@@ -253,15 +394,15 @@ class RichAgentRenderer:
             if parsed is not None:
                 self._render_json_panel(
                     data=parsed,
-                    title=self.theme.tool_output_title,
-                    border_style=self.theme.tool_output_style,
+                    title=self._tool_output_title,
+                    border_style=self._tool_output_style,
                 )
                 return
 
         self._render_text_panel(
             text=str(content),
-            title=self.theme.tool_output_title,
-            border_style=self.theme.tool_output_style,
+            title=self._tool_output_title,
+            border_style=self._tool_output_style,
         )
 
     # -------------------------
@@ -273,10 +414,13 @@ class RichAgentRenderer:
         Extract 'messages' from dict-like payloads; returns an empty list if missing.
         Normalizes singleton -> list.
         """
-        payload = self._unwrap_overwrite(payload)
-
-        messages = self._get_payload_value(payload, "messages", default=[])
-        messages = self._unwrap_overwrite(messages)
+        unwrap = self._unwrap_overwrite
+        payload = unwrap(payload)
+        if isinstance(payload, Mapping):
+            messages = payload.get("messages", [])
+        else:
+            messages = getattr(payload, "messages", [])
+        messages = unwrap(messages)
 
         if messages is None:
             return []
@@ -285,7 +429,6 @@ class RichAgentRenderer:
         return [messages]
 
     def _render_files_from_payload(self, payload: Any) -> None:
-        payload = self._unwrap_overwrite(payload)
         files = self._get_payload_value(payload, "files", default={}) or {}
         if not isinstance(files, Mapping):
             return
@@ -299,9 +442,14 @@ class RichAgentRenderer:
 
         preview = meta.get("content", [])
         if isinstance(preview, list):
-            preview = preview[: self.file_preview_lines]
+            preview = self._cap_preview_lines(preview[: self.file_preview_lines])
         else:
             preview = str(preview)
+            if len(preview) > self.file_preview_bytes:
+                # Bytes >= characters, so only long strings need encoding.
+                raw = preview.encode("utf-8")
+                if len(raw) > self.file_preview_bytes:
+                    preview = raw[: self.file_preview_bytes].decode("utf-8", "ignore") + _PREVIEW_TRUNCATED
 
         self._render_json_panel(
             data={
@@ -310,36 +458,89 @@ class RichAgentRenderer:
                 "modified_at": meta.get("modified_at"),
                 "preview": preview,
             },
-            title=f"{self.theme.file_title} — {path}",
-            border_style=self.theme.file_style,
+            title=f"{self._file_title} — {path}",
+            border_style=self._file_style,
         )
 
+    def _cap_preview_lines(self, lines: List[Any]) -> List[Any]:
+        """Keep leading lines until their UTF-8 size exceeds file_preview_bytes."""
+        budget = self.file_preview_bytes
+        for i, line in enumerate(lines):
+            line = line if isinstance(line, str) else str(line)
+            budget -= len(line) if line.isascii() else len(line.encode("utf-8"))
+            if budget < 0:
+                return lines[:i] + [_PREVIEW_TRUNCATED]
+        return lines
+
     def _render_system_payload(self, payload: Any) -> None:
         payload = self._unwrap_overwrite(payload)
 
         # Prefer JSON panel for dict/list payloads
         if isinstance(payload, (dict, list)):
-            self._render_json_panel(payload, self.theme.system_title, self.theme.system_style)
+            self._render_json_panel(payload, self._system_title, self._system_style)
         else:
-            self._render_text_panel(str(payload), self.theme.system_title, self.theme.system_style)
+            self._render_text_panel(str(payload), self._system_title, self._system_style)
 
     # -------------------------
     # Low-level rendering
     # -------------------------
 
+    @contextmanager
+    def _batched(self) -> Iterator[None]:
+        """
+        Collect renderables emitted inside the block and print them once on exit.
+        Nested blocks defer to the outermost one.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush()
+
+    def _emit(self, renderable: RenderableType) -> None:
+        self._buffer.append(renderable)
+        if self._batch_depth == 0:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        renderables = self._buffer
+        self._buffer = []
+        if len(renderables) == 1:
+            self.console.print(renderables[0])
+        else:
+            self.console.print(Group(*renderables))
+
+    @property
+    def _lexer(self) -> Union[Lexer, str]:
+        """Pygments lexer for text panels, resolved once instead of per Syntax."""
+        if self._lexer_instance is None:
+            try:
+                self._lexer_instance = get_lexer_by_name(self.markdown_lexer)
+            except ClassNotFound:
+                return self.markdown_lexer
+        return self._lexer_instance
+
     def _divider(self, label: str = "") -> None:
-        self.console.print(Rule(label, style=self.theme.divider_style))
+        self._emit(Rule(label, style=self._divider_style))
 
     def _render_text_panel(self, text: str, title: str, border_style: str) -> None:
-        syntax = Syntax(
-            text or "",
-            lexer=self.markdown_lexer,
-            theme=self.syntax_theme,
-            word_wrap=True,
-        )
-        self.console.print(
+        if text and _MARKDOWN_HINT_RE.search(text):
+            body: RenderableType = Syntax(
+                text,
+                lexer=self._lexer,
+                theme=self.syntax_theme,
+                word_wrap=True,
+            )
+        else:
+            # Nothing for the markdown lexer to highlight; skip the Pygments pass.
+            body = Text(text or "", tab_size=4)
+        self._emit(
             Panel(
-                syntax,
+                body,
                 title=title,
                 border_style=border_style,
                 padding=(1, 2),
@@ -347,9 +548,9 @@ class RichAgentRenderer:
         )
 
     def _render_json_panel(self, data: Any, title: str, border_style: str) -> None:
-        self.console.print(
+        self._emit(
             Panel(
-                JSON.from_data(data, indent=2),
+                _json_text(data),
                 title=title,
                 border_style=border_style,
                 padding=(1, 1),
@@ -362,6 +563,10 @@ class RichAgentRenderer:
 
     @staticmethod
     def _extract_single_kv(mapping: Mapping[str, Any]) -> Tuple[str, Any]:
+        # Stream events are plain single-key dicts; take them without building an items view.
+        if type(mapping) is dict and len(mapping) == 1:
+            for key in mapping:
+                return key, mapping[key]
         if not mapping:
             raise ValueError("Event payload is empty.")
         if len(mapping) != 1:
@@ -372,7 +577,7 @@ class RichAgentRenderer:
     @staticmethod
     def _try_parse_json(text: str) -> Optional[Any]:
         try:
-            return json.loads(text)
+            return _loads(text)
         except Exception:
             return None
 
@@ -381,10 +586,16 @@ class RichAgentRenderer:
         """
         Unwrap LangGraph Overwrite wrapper without requiring a direct import.
         """
-        if value is None:
-            return None
-        # Common pattern: Overwrite(value=<payload>)
-        if getattr(value, "__class__", None) and value.__class__.__name__ == "Overwrite":
+        global _OVERWRITE_CLS
+        cls = type(value)
+        # Plain dict/list state updates are the hot path; skip the name probe.
+        if cls is dict or cls is list:
+            return value
+        if cls is _OVERWRITE_CLS:
+            return value.value
+        # Common pattern: Overwrite(value=<payload>); remember the class on first sight.
+        if _OVERWRITE_CLS is None and cls.__name__ == "Overwrite":
+            _OVERWRITE_CLS = cls
             return getattr(value, "value", value)
         return value
 
@@ -400,4 +611,14 @@ class RichAgentRenderer:
 # Convenience functions
 # -----------------------------
 
-_DEFAULT_RENDERER = RichAgentRenderer()
+@lru_cache(maxsize=None)
+def _default_renderer() -> RichAgentRenderer:
+    """Shared renderer, built on first use so importing this module stays cheap."""
+    return RichAgentRenderer()
+
+
+def __getattr__(name: str) -> Any:
+    # Backwards compatibility for `from smartagent.renderer import _DEFAULT_RENDERER`.
+    if name == "_DEFAULT_RENDERER":
+        return _default_renderer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
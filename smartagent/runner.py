@@ -1,13 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+
 from dotenv import load_dotenv
 
-from smartagent.renderer import _DEFAULT_RENDERER
+from smartagent.renderer import _default_renderer
 from smartagent.agent import build_agent
-from deepagents import create_deep_agent
-from deepagents.backends import CompositeBackend, StateBackend, StoreBackend
-from langgraph.store.memory import InMemoryStore
-from deepagents.backends import FilesystemBackend
+from deepagents.backends import CompositeBackend, StateBackend
 
 
 #--- SANDBOX ---
@@ -53,8 +52,40 @@ agent = build_agent(
 
 
 
-if __name__ == "__main__":
+async def stream_request(request_message: dict) -> dict | None:
+    """Run one request through the agent, rendering updates as they arrive.
+
+    The stream is consumed once: "updates" events drive the renderer and the
+    last "values" event is the final state, so the agent never has to be
+    re-invoked to get its output.
+    """
     final_state = None
+    async for mode, chunk in agent.astream(
+        request_message,
+        stream_mode=["updates", "values"],  # stream deltas + full state
+    ):
+        if mode == "updates":
+            # Your existing Rich renderer expects a dict event
+            _default_renderer().render_stream_event(chunk)
+        elif mode == "values":
+            # Keep overwriting; the last one is the final state
+            final_state = chunk
+    return final_state
+
+
+if __name__ == "__main__":
+    from rich.panel import Panel
+    from rich.text import Text
+
+    _default_renderer().console.print(
+        Panel(
+            Text("Initialize unzip tool."),
+            title="STEP 3: Initialize Tools",
+            border_style="purple",
+            padding=(1, 2),
+        )
+    )
+
     request_dict = {
         "report generation": "Write me a /final_report.md based on the files from the zip file inside the /workspace, write the summary report in pure Chinese, make it extremly long and detailed, use as many as references from Chinese Commnunist Party history or Communism Theory as possible, make it official and academic style, targeting as a report for the central standing committee of the Communist Party of China.",
 
@@ -72,18 +103,8 @@ if __name__ == "__main__":
             }
         ],
     }
-    for mode, chunk in agent.stream(
-        request_message,
-        stream_mode=["updates", "values"],  # stream deltas + full state
-    ):
-        if mode == "updates":
-            # Your existing Rich renderer expects a dict event
-            _DEFAULT_RENDERER.render_stream_event(chunk)
-        elif mode == "values":
-            # Keep overwriting; the last one is the final state
-            print(chunk)
-            final_state = chunk
+    final_state = asyncio.run(stream_request(request_message))
 
     # Now you have the final output (messages + files) without invoking again
-    _DEFAULT_RENDERER.render_final_output(final_state)
+    _default_renderer().render_final_output(final_state)
     # print(final_state.get("files", {}))
@@ -1,18 +1,56 @@
-from deepagents import create_deep_agent
-from deepagents.backends import CompositeBackend, StateBackend, StoreBackend
 from deepagents.backends import FilesystemBackend
 from deepagents.backends.protocol import ExecuteResponse, SandboxBackendProtocol
-from langgraph.store.memory import InMemoryStore
+import os
+import re
+import shlex
 import subprocess
-from typing import Dict, Any
-import pandas as pd
-from langchain.tools import tool
+import threading
+import time
 from pathlib import Path
-import os
+from typing import IO
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Anything the shell would expand, redirect, chain or unescape. Commands free
+# of these split the same under shlex as under /bin/sh and can skip the shell.
+_SHELL_SYNTAX_RE = re.compile(r"[|&;<>()$`\\*?\[\]{}~#!\n]")
+# Builtins with no standalone executable, or whose effect needs the shell.
+_SHELL_BUILTINS = frozenset(
+    {".", ":", "alias", "cd", "command", "eval", "exec", "exit", "export", "readonly",
+     "return", "set", "shift", "source", "trap", "ulimit", "umask", "unset", "wait"}
+)
 
 
+def _direct_argv(command: str) -> list[str] | None:
+    """Return the argv for ``command`` when it needs no shell, else None."""
+    if os.name != "posix" or _SHELL_SYNTAX_RE.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    # "VAR=value cmd" is a shell environment assignment, not a program name.
+    if not argv or argv[0] in _SHELL_BUILTINS or "=" in argv[0]:
+        return None
+    return argv
 
 
+def _read_capped(stream: IO[bytes], buf: bytearray, limit: int) -> None:
+    """
+    Read ``stream`` to EOF, keeping at most ``limit + 1`` bytes in ``buf``.
+
+    Bytes past the cap are read and discarded so the child never blocks on a
+    full pipe; the extra byte tells the caller the output was truncated.
+    """
+    with stream:
+        while True:
+            chunk = stream.read1(_READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            room = limit + 1 - len(buf)
+            if room > 0:
+                buf += chunk[:room]
+
 
 class LocalSandboxBackend(FilesystemBackend, SandboxBackendProtocol):
     def __init__(
@@ -29,22 +67,28 @@ class LocalSandboxBackend(FilesystemBackend, SandboxBackendProtocol):
         self._timeout = timeout
         self._max_output_bytes = max_output_bytes
         self._env = env if env is not None else os.environ.copy()
-        self._path_aliases = path_aliases or {}
+        # Virtual root -> resolved real root, resolved once here rather than per
+        # command, matched in one regex pass with longer roots taking priority.
+        self._path_aliases: dict[str, str] = {}
+        for virtual_path, real_path in (path_aliases or {}).items():
+            virtual_root = virtual_path.rstrip("/")
+            if virtual_root:
+                self._path_aliases[virtual_root] = str(Path(real_path).resolve()).rstrip("/")
+        self._alias_re = (
+            re.compile("|".join(re.escape(root) for root in sorted(self._path_aliases, key=len, reverse=True)))
+            if self._path_aliases
+            else None
+        )
 
     @property
     def id(self) -> str:
         return f"local:{self.cwd}"
 
     def _apply_path_aliases(self, command: str) -> str:
-        if not self._path_aliases:
+        if self._alias_re is None:
             return command
-        updated = command
-        for virtual_path, real_path in self._path_aliases.items():
-            virtual_root = virtual_path.rstrip("/")
-            real_root = str(Path(real_path).resolve()).rstrip("/")
-            updated = updated.replace(f"{virtual_root}/", f"{real_root}/")
-            updated = updated.replace(virtual_root, real_root)
-        return updated
+        # Single pass: a substituted real path is never rescanned for aliases.
+        return self._alias_re.sub(lambda m: self._path_aliases[m.group(0)], command)
 
     def execute(self, command: str) -> ExecuteResponse:
         if not isinstance(command, str) or not command.strip():
@@ -55,56 +99,46 @@ class LocalSandboxBackend(FilesystemBackend, SandboxBackendProtocol):
             )
 
         command = self._apply_path_aliases(command)
+        deadline = time.monotonic() + self._timeout
+        # stderr is merged into stdout and read in bytes: memory stays bounded by
+        # the output cap and only the kept bytes are decoded.
+        popen_kwargs = dict(cwd=str(self.cwd), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=self._env)
+        argv = _direct_argv(command)
+        proc = None
+        if argv is not None:
+            # Simple commands run without the intermediate /bin/sh process.
+            try:
+                proc = subprocess.Popen(argv, **popen_kwargs)
+            except OSError:
+                # Let the shell report a missing or non-executable program.
+                proc = None
+        if proc is None:
+            proc = subprocess.Popen(command, shell=True, **popen_kwargs)
+        buf = bytearray()
+        reader = threading.Thread(
+            target=_read_capped,
+            args=(proc.stdout, buf, self._max_output_bytes),
+            daemon=True,
+        )
+        reader.start()
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=str(self.cwd),
-                capture_output=True,
-                text=True,
-                timeout=self._timeout,
-                env=self._env,
-            )
+            proc.wait(timeout=max(deadline - time.monotonic(), 0))
+            # A background child can keep the pipe open past the shell's exit.
+            reader.join(timeout=max(deadline - time.monotonic(), 0))
+            if reader.is_alive():
+                raise subprocess.TimeoutExpired(command, self._timeout)
         except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
             return ExecuteResponse(
                 output=f"Error: Command timed out after {self._timeout:.1f} seconds.",
                 exit_code=124,
                 truncated=False,
             )
 
-        output_parts: list[str] = []
-        if result.stdout:
-            output_parts.append(result.stdout)
-        if result.stderr:
-            output_parts.append(result.stderr)
-        output = "\n".join(output_parts) if output_parts else "<no output>"
-
-        truncated = False
-        if len(output) > self._max_output_bytes:
-            output = output[: self._max_output_bytes]
-            truncated = True
-
-        return ExecuteResponse(output=output, exit_code=result.returncode, truncated=truncated)
-
-
-# workspace_root = str(Path("./workspace").resolve())
-# composite_backend = lambda rt: CompositeBackend(
-#     default=LocalSandboxBackend(
-#         root_dir=".",
-#         virtual_mode=True,
-#         path_aliases={
-#             "/workspace": workspace_root,
-#         },
-#     ),
-#     routes={
-#         "/workspace/": LocalSandboxBackend(root_dir="./workspace", virtual_mode=True),
-#     },
-# )
+        truncated = len(buf) > self._max_output_bytes
+        if truncated:
+            del buf[self._max_output_bytes :]
+        output = buf.decode("utf-8", "replace") if buf else "<no output>"
 
-# agent = create_deep_agent(
-#     model=model,
-#     tools=all_tools,
-#     system_prompt=ORCHESTRATOR_SYSTEM_PROMPT + DELEGATION_INSTRUCTIONS,
-#     subagents=[transcription_processing_agent],
-#     backend=composite_backend,
-# )
+        return ExecuteResponse(output=output, exit_code=proc.returncode, truncated=truncated)
@@ -1,11 +1,84 @@
 from __future__ import annotations
 
-from typing import Optional
+import atexit
+from functools import lru_cache
+import io
+import json
+import struct
+from typing import IO, TYPE_CHECKING, Optional
 
 from langchain.tools import tool
 
 from smartagent.workspace import resolve_workspace_path
 
+if TYPE_CHECKING:
+    import httpx
+
+# Converted WAV output up to this size stays in memory; longer recordings
+# (16 kHz mono PCM is ~115 MB per hour) spill to a temp file instead.
+_WAV_MEMORY_LIMIT = 32 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def _whisper_client() -> "httpx.Client":
+    """
+    Process-wide HTTP client for the whisper server.
+
+    Reusing one client keeps the connection alive across transcriptions instead
+    of paying a new TCP (and TLS) handshake per file. Timeouts are set per request.
+    """
+    import httpx
+
+    client = httpx.Client()
+    atexit.register(client.close)
+    return client
+
+
+def _spool_output(stream: IO[bytes]) -> IO[bytes]:
+    """
+    Drain ``stream`` into a seekable buffer for upload.
+
+    The data is held in memory until it exceeds _WAV_MEMORY_LIMIT, then moves
+    to an anonymous temp file. The caller owns (and must close) the result.
+    """
+    import tempfile
+
+    buffer: IO[bytes] = io.BytesIO()
+    while chunk := stream.read(1024 * 1024):
+        if isinstance(buffer, io.BytesIO) and buffer.tell() + len(chunk) > _WAV_MEMORY_LIMIT:
+            spill = tempfile.TemporaryFile()
+            spill.write(buffer.getbuffer())
+            buffer = spill
+        buffer.write(chunk)
+    return buffer
+
+
+def _fix_wav_sizes(wav: IO[bytes]) -> None:
+    """
+    Fill in the RIFF and data chunk sizes of a WAV written to a pipe.
+
+    ffmpeg cannot seek back on non-seekable output, so it leaves placeholder
+    sizes that strict readers reject; the full length is known once buffered.
+    Only the header fields are rewritten in place.
+    """
+    total = wav.seek(0, io.SEEK_END)
+    wav.seek(0)
+    head = wav.read(12)
+    if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return
+    wav.seek(4)
+    wav.write(struct.pack("<I", min(total - 8, 0xFFFFFFFF)))
+    pos = 12
+    while pos + 8 <= total:
+        wav.seek(pos)
+        chunk_id, size = struct.unpack("<4sI", wav.read(8))
+        if chunk_id == b"data":
+            wav.seek(pos + 4)
+            wav.write(struct.pack("<I", min(total - pos - 8, 0xFFFFFFFF)))
+            return
+        pos += 8 + size + (size & 1)
+
+
 @tool(parse_docstring=True)
 def audio_transcribe(
     virtual_audio_path: str,
@@ -85,8 +158,9 @@ def audio_transcribe(
             "error": "Path is not a file.",
         }
 
-    temp_dir: Optional[tempfile.TemporaryDirectory] = None
-    upload_path = audio_path
+    upload_name = audio_path.name
+    # Converted audio is buffered once (memory, or disk when long) and uploaded.
+    converted_wav: Optional[IO[bytes]] = None
     converted = False
 
     if audio_path.suffix.lower() != ".wav":
@@ -105,14 +179,11 @@ def audio_transcribe(
                 "error": "ffmpeg not found on PATH. Install ffmpeg or disable convert_to_wav.",
             }
 
-        temp_dir = tempfile.TemporaryDirectory()
-        output_path = Path(temp_dir.name) / f"{audio_path.stem}.wav"
         cmd = [
             ffmpeg,
             "-hide_banner",
             "-loglevel",
             "error",
-            "-y",
             "-i",
             str(audio_path),
             "-ar",
@@ -121,19 +192,28 @@ def audio_transcribe(
             "1",
             "-c:a",
             "pcm_s16le",
-            str(output_path),
+            "-f",
+            "wav",
+            "pipe:1",
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        if result.returncode != 0:
-            temp_dir.cleanup()
-            return {
-                "status": "error",
-                "audio": virtual_audio_path,
-                "error": "ffmpeg failed to convert the input to WAV.",
-                "details": result.stderr.strip() or "No stderr output.",
-            }
+        # stderr goes to a file so a chatty ffmpeg cannot block on a full pipe
+        # while stdout is being drained.
+        with tempfile.TemporaryFile() as stderr:
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr) as proc:
+                converted_wav = _spool_output(proc.stdout)
+            if proc.returncode != 0:
+                converted_wav.close()
+                stderr.seek(0)
+                return {
+                    "status": "error",
+                    "audio": virtual_audio_path,
+                    "error": "ffmpeg failed to convert the input to WAV.",
+                    "details": stderr.read().decode("utf-8", "replace").strip() or "No stderr output.",
+                }
 
-        upload_path = output_path
+        _fix_wav_sizes(converted_wav)
+        converted_wav.seek(0)
+        upload_name = f"{audio_path.stem}.wav"
         converted = True
 
     data = {
@@ -146,21 +226,22 @@ def audio_transcribe(
     if prompt:
         data["prompt"] = prompt
 
-    content_type = "audio/wav" if upload_path.suffix.lower() == ".wav" else "application/octet-stream"
+    content_type = "audio/wav" if upload_name.lower().endswith(".wav") else "application/octet-stream"
     try:
-        with upload_path.open("rb") as handle:
-            files = {"file": (upload_path.name, handle, content_type)}
-            with httpx.Client(timeout=timeout_sec) as client:
-                response = client.post(server_url, data=data, files=files)
+        if converted_wav is not None:
+            with converted_wav:
+                files = {"file": (upload_name, converted_wav, content_type)}
+                response = _whisper_client().post(server_url, data=data, files=files, timeout=timeout_sec)
+        else:
+            with audio_path.open("rb") as handle:
+                files = {"file": (upload_name, handle, content_type)}
+                response = _whisper_client().post(server_url, data=data, files=files, timeout=timeout_sec)
     except httpx.RequestError as exc:
         return {
             "status": "error",
             "audio": virtual_audio_path,
             "error": f"Request failed: {exc}",
         }
-    finally:
-        if temp_dir is not None:
-            temp_dir.cleanup()
 
     if response.is_error:
         body = response.text.strip()
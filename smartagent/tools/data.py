@@ -1,9 +1,30 @@
 from __future__ import annotations
 
+import pandas as pd
 from langchain.tools import tool
 
 from smartagent.workspace import resolve_workspace_path
 
+# Data rows sampled per sheet when inferring column dtypes for the schema.
+_SCHEMA_SAMPLE_ROWS = 50
+
+
+def _count_data_rows(ws) -> int:
+    """
+    Count the rows read_excel would return for a read-only openpyxl sheet.
+
+    Like pandas, rows up to the last one holding a value are data, including
+    blank rows in between; the first row is the header.
+    """
+    # Stored dimensions also cover cells that only carry styling.
+    ws.reset_dimensions()
+    last = 0
+    for index, row in enumerate(ws.iter_rows(values_only=True)):
+        if any(value is not None and value != "" for value in row):
+            last = index
+    return last
+
+
 @tool(parse_docstring=True)
 def excel_schema_reader(virtual_excel_path: str) -> dict:
     """
@@ -33,8 +54,9 @@ def excel_schema_reader(virtual_excel_path: str) -> dict:
         - status: Execution status string
         - excel: The input virtual Excel path
         - sheets: Mapping from sheet name to schema information:
-            - num_rows: Number of rows in the sheet
+            - num_rows: Number of data rows in the sheet (header excluded)
             - columns: List of column descriptors with name and dtype
+              (dtype is inferred from the first 50 data rows)
 
     Raises:
         FileNotFoundError: If the Excel file does not exist.
@@ -47,23 +69,29 @@ def excel_schema_reader(virtual_excel_path: str) -> dict:
         raise FileNotFoundError(excel_path)
 
     try:
-        sheets = pd.read_excel(excel_path, sheet_name=None)
+        # openpyxl opens the workbook read-only, so rows are streamed.
+        workbook = pd.ExcelFile(excel_path, engine="openpyxl")
     except Exception as e:
         raise ValueError(f"Failed to read Excel file: {e}")
 
     schema = {}
 
-    for sheet_name, df in sheets.items():
-        schema[sheet_name] = {
-            "num_rows": len(df),
-            "columns": [
-                {
-                    "name": col,
-                    "dtype": str(df[col].dtype),
-                }
-                for col in df.columns
-            ],
-        }
+    with workbook:
+        for sheet_name in workbook.sheet_names:
+            # pandas parses just the header and a sample, so names and dtypes
+            # match read_excel without materializing the whole sheet.
+            sample = workbook.parse(sheet_name, nrows=_SCHEMA_SAMPLE_ROWS)
+
+            schema[sheet_name] = {
+                "num_rows": _count_data_rows(workbook.book[sheet_name]),
+                "columns": [
+                    {
+                        "name": col,
+                        "dtype": str(dtype),
+                    }
+                    for col, dtype in sample.dtypes.items()
+                ],
+            }
 
     return {
         "status": "ok",
@@ -107,7 +135,7 @@ def excel_entry_extractor(
         columns: Optional list of column names to return.
             If omitted, all columns are included.
         max_rows: Maximum number of rows to return.
-        filters: Optional exact-match filters in the form `{column_name: value}`. Filters are applied sequentially.
+        filters: Optional exact-match filters in the form `{column_name: value}`. All filters must match.
 
     Returns:
         A dictionary containing:
@@ -124,17 +152,32 @@ def excel_entry_extractor(
     if not excel_path.exists():
         raise FileNotFoundError(excel_path)
 
-    sheets = pd.read_excel(excel_path, sheet_name=None)
+    # Parse only the requested sheet; the sheet list comes from workbook metadata.
+    with pd.ExcelFile(excel_path) as workbook:
+        if sheet_name not in workbook.sheet_names:
+            raise ValueError(f"Sheet not found: {sheet_name}")
+
+        usecols = None
+        if columns:
+            # Filter columns must survive pruning; a callable tolerates missing
+            # names so the selection below still reports them as before.
+            wanted = set(columns).union(filters or ())
+            usecols = wanted.__contains__
 
-    if sheet_name not in sheets:
-        raise ValueError(f"Sheet not found: {sheet_name}")
+        # Without filters the first max_rows rows are the answer.
+        nrows = max_rows if not filters and max_rows >= 0 else None
 
-    df = sheets[sheet_name]
+        df = workbook.parse(sheet_name, usecols=usecols, nrows=nrows)
 
     if filters:
+        # AND the per-column matches into one mask and select rows once.
+        mask = None
         for col, val in filters.items():
             if col in df.columns:
-                df = df[df[col] == val]
+                hit = df[col] == val
+                mask = hit if mask is None else mask & hit
+        if mask is not None:
+            df = df[mask]
 
     if columns:
         df = df[columns]
@@ -1,11 +1,96 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Mapping, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import io
+import multiprocessing
+import os
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from langchain.tools import tool
 
 from smartagent.workspace import resolve_workspace_path
 
+# pypdf text extraction is pure Python, but each spawned pool worker re-imports
+# the tools package (around a second) and re-parses the PDF. Only large page
+# ranges win, so the default num_pages stays on the serial path.
+_PARALLEL_PDF_MIN_PAGES = 128
+
+# Style-name patterns used by word_reader for every paragraph.
+_HEADING_NUM_RE = re.compile(r"(\d+)")
+_TRAILING_NUM_RE = re.compile(r"(\d+)$")
+
+# Single-pass text normalization for word_reader. str.translate substitutes
+# every character independently and never rescans a replacement, so:
+# - escaping the backslash alongside the markdown specials matches escaping
+#   it first;
+# - ">" maps straight to "&gt;" (HTML escaping ran before markdown escaping);
+# - line breaks can map directly to "<br>" / "  \n" without being escaped.
+_MD_ESCAPES = {ch: "\\" + ch for ch in "\\`*_{}[]()#+!|>"}
+_HTML_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+_WHITESPACE = {"\r": None, "\t": "    "}
+_BODY_TEXT_TABLE = str.maketrans({**_MD_ESCAPES, **_HTML_ESCAPES, **_WHITESPACE, "\n": "  \n"})
+_TABLE_CELL_TEXT_TABLE = str.maketrans({**_MD_ESCAPES, **_HTML_ESCAPES, **_WHITESPACE, "\n": "<br>"})
+
+
+@lru_cache(maxsize=64)
+def _enum_str(value: Any) -> str:
+    """str() of a python-docx enum member; the few members in use repeat per run."""
+    return str(value)
+
+
+@lru_cache(maxsize=256)
+def _classify_style(
+    style_id: Optional[str], style_name: Optional[str]
+) -> Tuple[Optional[int], Optional[str], Optional[int], bool]:
+    """
+    Classify a paragraph style as ``(heading_level, list_type, list_level, is_quote)``.
+
+    Only the style id and name are consulted; numbering set directly on a
+    paragraph is applied by the caller. A document uses a handful of styles,
+    so nearly every paragraph is a cache hit.
+    """
+    id_lower = style_id.lower() if style_id else ""
+    name_lower = style_name.lower() if style_name else ""
+
+    heading_level = None
+    for source, lower in ((style_id, id_lower), (style_name, name_lower)):
+        if lower.startswith("heading"):
+            match = _HEADING_NUM_RE.search(source)
+            if match:
+                heading_level = max(1, min(int(match.group(1)), 6))
+                break
+    if heading_level is None:
+        if id_lower == "title" or name_lower == "title":
+            heading_level = 1
+        elif id_lower == "subtitle" or name_lower == "subtitle":
+            heading_level = 2
+
+    combined = f"{id_lower} {name_lower}"
+    list_type = None
+    if "bullet" in combined:
+        list_type = "bullet"
+    elif "number" in combined or "decimal" in combined or "list" in combined:
+        list_type = "number"
+
+    list_level = None
+    if style_name:
+        match = _TRAILING_NUM_RE.search(style_name)
+        if match:
+            list_level = int(match.group(1))
+
+    return heading_level, list_type, list_level, "quote" in combined
+
+
+def _extract_pdf_pages(pdf_path: str, indices: List[int]) -> List[str]:
+    """Process-pool worker: extract text for ``indices`` with a private reader."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() for i in indices]
+
+
 @tool(parse_docstring=True)
 def pdf_reader(virtual_pdf_path: str, num_pages: int = 5) -> dict:
     """
@@ -52,12 +137,25 @@ def pdf_reader(virtual_pdf_path: str, num_pages: int = 5) -> dict:
         raise ValueError("Provided file is not a PDF file")
 
     reader = PdfReader(str(pdf_path))
-    content = []
-
-    for i, page in enumerate(reader.pages):
-        if i >= num_pages:
-            break
-        content.append(page.extract_text())
+    n = max(0, min(num_pages, len(reader.pages)))
+
+    workers = min(n, os.cpu_count() or 1)
+    if n < _PARALLEL_PDF_MIN_PAGES or workers < 2:
+        content = [reader.pages[i].extract_text() for i in range(n)]
+    else:
+        shards = [list(range(w, n, workers)) for w in range(workers)]
+        content = [None] * n
+        # Spawned workers: forking a threaded agent process can copy a held
+        # lock into the child and deadlock it.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(_extract_pdf_pages, str(pdf_path), shard)
+                for shard in shards
+            ]
+            for shard, future in zip(shards, futures):
+                for i, text in zip(shard, future.result()):
+                    content[i] = text
 
     return {
         "status": "ok",
@@ -96,7 +194,8 @@ def word_reader(virtual_docx_path: str, max_blocks: int = 200) -> dict:
         - status: Execution status string
         - word: The input virtual Word path
         - metadata: Core document metadata (title, author, timestamps)
-        - blocks: Structured blocks with formatting info
+        - blocks: Structured blocks with formatting info (run formatting
+          lists only attributes set on the run; absent keys are inherited)
         - markdown: Markdown rendering of the document
         - blocks_returned: Number of blocks returned
         - truncated: Whether the output was truncated by max_blocks
@@ -108,8 +207,10 @@ def word_reader(virtual_docx_path: str, max_blocks: int = 200) -> dict:
         from docx import Document
         from docx.oxml.table import CT_Tbl
         from docx.oxml.text.paragraph import CT_P
+        from docx.oxml.text.run import CT_R
         from docx.table import Table
         from docx.text.paragraph import Paragraph
+        from docx.text.run import Run
     except Exception as exc:
         return {
             "status": "error",
@@ -117,8 +218,6 @@ def word_reader(virtual_docx_path: str, max_blocks: int = 200) -> dict:
             "error": f"python-docx is required to read Word files: {exc}",
         }
 
-    import re
-
     docx_path = resolve_workspace_path(virtual_docx_path)
 
     if not docx_path.exists():
@@ -133,52 +232,42 @@ def word_reader(virtual_docx_path: str, max_blocks: int = 200) -> dict:
 
     document = Document(str(docx_path))
 
-    def iter_block_items(doc: Document) -> Iterable[Union[Paragraph, Table]]:
-        for child in doc.element.body.iterchildren():
-            if isinstance(child, CT_P):
-                yield Paragraph(child, doc)
-            elif isinstance(child, CT_Tbl):
-                yield Table(child, doc)
-
-    def escape_markdown_chars(text: str) -> str:
-        text = text.replace("\\", "\\\\")
-        for ch in ("`", "*", "_", "{", "}", "[", "]", "(", ")", "#", "+", "!", "|", ">"):
-            text = text.replace(ch, f"\\{ch}")
-        return text
-
-    def escape_html(text: str) -> str:
-        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-
     def normalize_text(text: str, in_table: bool = False) -> str:
         if not text:
             return ""
-        text = text.replace("\r", "")
-        text = text.replace("\t", "    ")
-        token = "__DOCX_BR__"
-        text = text.replace("\n", token)
-        text = escape_html(text)
-        text = escape_markdown_chars(text)
-        if in_table:
-            return text.replace(token, "<br>")
-        return text.replace(token, "  \n")
-
-    def resolve_emphasis(run) -> Tuple[bool, bool]:
-        bold = run.bold
-        italic = run.italic
-        style_name = (run.style.name if run.style else "").lower()
-        if bold is None and ("strong" in style_name or "bold" in style_name):
-            bold = True
-        if italic is None and ("emphasis" in style_name or "italic" in style_name):
-            italic = True
-        return bool(bold), bool(italic)
-
-    def run_to_markdown(run, in_table: bool = False) -> str:
-        raw_text = run.text
-        if raw_text is None or raw_text == "":
-            return ""
+        return text.translate(_TABLE_CELL_TEXT_TABLE if in_table else _BODY_TEXT_TABLE)
+
+    # Character style id -> style name. run.style searches the styles part on
+    # every access, while a document only references a few character styles.
+    run_style_names: Dict[Optional[str], Optional[str]] = {}
+
+    def run_style_name(run, r_pr) -> Optional[str]:
+        style_id = r_pr.style if r_pr is not None else None
+        try:
+            return run_style_names[style_id]
+        except KeyError:
+            style = run.style
+            name = run_style_names[style_id] = style.name if style else None
+            return name
+
+    def run_to_markdown(run, raw_text: str, in_table: bool = False) -> str:
         text = normalize_text(raw_text, in_table=in_table)
-        bold, italic = resolve_emphasis(run)
-        strike = True if run.font.strike else False
+        r_pr = run._r.rPr
+        if r_pr is None:
+            # No run properties: nothing is set directly on the run.
+            bold = italic = strike = None
+        else:
+            bold = run.bold
+            italic = run.italic
+            strike = run.font.strike
+        if bold is None or italic is None:
+            style_name = (run_style_name(run, r_pr) or "").lower()
+            if bold is None and ("strong" in style_name or "bold" in style_name):
+                bold = True
+            if italic is None and ("emphasis" in style_name or "italic" in style_name):
+                italic = True
+        if not (bold or italic or strike):
+            return text
         if bold and italic:
             text = f"***{text}***"
         elif bold:
@@ -189,60 +278,29 @@ def word_reader(virtual_docx_path: str, max_blocks: int = 200) -> dict:
             text = f"~~{text}~~"
         return text
 
-    def paragraph_to_markdown(paragraph: Paragraph, in_table: bool = False) -> str:
-        parts: List[str] = []
-        for run in paragraph.runs:
-            part = run_to_markdown(run, in_table=in_table)
-            if part:
-                parts.append(part)
-        if not parts:
-            return normalize_text(paragraph.text or "", in_table=in_table)
-        return "".join(parts)
-
     def detect_heading_level(style_id: Optional[str], style_name: Optional[str]) -> Optional[int]:
-        for source in (style_id, style_name):
-            if not source:
-                continue
-            lower = source.lower()
-            if lower.startswith("heading"):
-                match = re.search(r"(\d+)", source)
-                if match:
-                    level = int(match.group(1))
-                    return max(1, min(level, 6))
-        if style_id and style_id.lower() == "title":
-            return 1
-        if style_name and style_name.lower() == "title":
-            return 1
-        if style_id and style_id.lower() == "subtitle":
-            return 2
-        if style_name and style_name.lower() == "subtitle":
-            return 2
-        return None
+        return _classify_style(style_id, style_name)[0]
 
     def detect_list_info(paragraph: Paragraph, style_id: Optional[str], style_name: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
-        list_type = None
-        list_level = None
-        combined = f"{style_id or ''} {style_name or ''}".lower()
+        _, list_type, style_level, _ = _classify_style(style_id, style_name)
 
-        if "bullet" in combined:
-            list_type = "bullet"
-        elif "number" in combined or "decimal" in combined:
-            list_type = "number"
-        elif "list" in combined:
+        p_pr = paragraph._p.pPr
+        num_pr = p_pr.numPr if p_pr is not None else None
+        if num_pr is None:
+            # Most paragraphs: no direct numbering, so the style decides alone.
+            if list_type and style_level is None:
+                return list_type, 1
+            return list_type, style_level
+
+        list_level = None
+        ilvl = num_pr.ilvl
+        if ilvl is not None and ilvl.val is not None:
+            list_level = int(ilvl.val) + 1
+        if list_type is None:
             list_type = "number"
 
-        p_pr = paragraph._p.pPr
-        if p_pr is not None and p_pr.numPr is not None:
-            ilvl = p_pr.numPr.ilvl
-            if ilvl is not None and ilvl.val is not None:
-                list_level = int(ilvl.val) + 1
-            if list_type is None:
-                list_type = "number"
-
-        if list_level is None and style_name:
-            match = re.search(r"(\d+)$", style_name)
-            if match:
-                list_level = int(match.group(1))
+        if list_level is None:
+            list_level = style_level
 
         if list_type and list_level is None:
             list_level = 1
@@ -250,42 +308,56 @@ def word_reader(virtual_docx_path: str, max_blocks: int = 200) -> dict:
         return list_type, list_level
 
     def is_quote_style(style_id: Optional[str], style_name: Optional[str]) -> bool:
-        combined = f"{style_id or ''} {style_name or ''}".lower()
-        return "quote" in combined
+        return _classify_style(style_id, style_name)[3]
 
     def extract_run_format(run) -> Dict[str, Any]:
+        """Formatting explicitly set on ``run``; inherited (None) attributes are omitted."""
+        r_pr = run._r.rPr
+        style_name = run_style_name(run, r_pr)
+        if r_pr is None:
+            # Every font attribute reads w:rPr, so without it only the style remains.
+            return {"style": style_name} if style_name is not None else {}
+
+        font = run.font
+
         underline = run.underline
         if underline is not None and underline not in (True, False):
-            underline = str(underline)
+            underline = _enum_str(underline)
 
         color = None
-        if run.font.color is not None:
-            if run.font.color.rgb is not None:
-                color = f"#{run.font.color.rgb}"
-            elif run.font.color.theme_color is not None:
-                color = str(run.font.color.theme_color)
-
-        highlight = None
-        if run.font.highlight_color is not None:
-            highlight = str(run.font.highlight_color)
-
-        size_pt = run.font.size.pt if run.font.size else None
-
-        return {
-            "bold": run.bold,
-            "italic": run.italic,
-            "underline": underline,
-            "strike": run.font.strike,
-            "superscript": run.font.superscript,
-            "subscript": run.font.subscript,
-            "font_name": run.font.name,
-            "font_size_pt": size_pt,
-            "color": color,
-            "highlight": highlight,
-            "style": run.style.name if run.style else None,
-        }
-
-    def extract_paragraph_info(paragraph: Paragraph) -> Dict[str, Any]:
+        color_obj = font.color
+        if color_obj is not None:
+            rgb = color_obj.rgb
+            if rgb is not None:
+                color = f"#{rgb}"
+            else:
+                theme_color = color_obj.theme_color
+                if theme_color is not None:
+                    color = _enum_str(theme_color)
+
+        highlight = font.highlight_color
+        if highlight is not None:
+            highlight = _enum_str(highlight)
+
+        size = font.size
+
+        pairs = (
+            ("bold", run.bold),
+            ("italic", run.italic),
+            ("underline", underline),
+            ("strike", font.strike),
+            ("superscript", font.superscript),
+            ("subscript", font.subscript),
+            ("font_name", font.name),
+            ("font_size_pt", size.pt if size else None),
+            ("color", color),
+            ("highlight", highlight),
+            ("style", style_name),
+        )
+        return {key: value for key, value in pairs if value is not None}
+
+    def extract_paragraph_info(paragraph: Paragraph, in_table: bool = False) -> Tuple[Dict[str, Any], str]:
+        """Return the block info and Markdown for ``paragraph`` from one walk over its runs."""
         style = paragraph.style
         style_name = style.name if style else None
         style_id = style.style_id if style else None
@@ -301,19 +373,32 @@ def word_reader(virtual_docx_path: str, max_blocks: int = 200) -> dict:
         elif quote:
             block_type = "quote"
 
+        # Same children, in the same order, that Paragraph.text concatenates, so
+        # the paragraph text falls out of the run walk. Hyperlinks contribute
+        # text only; runs and Markdown come from direct w:r children as before.
         runs: List[Dict[str, Any]] = []
-        for run in paragraph.runs:
-            if run.text is None or run.text == "":
+        md_parts: List[str] = []
+        text_parts: List[str] = []
+        for child in paragraph._p.xpath("w:r | w:hyperlink"):
+            raw_text = child.text
+            if not raw_text:
                 continue
-            runs.append({"text": run.text, "formatting": extract_run_format(run)})
+            text_parts.append(raw_text)
+            if type(child) is CT_R:
+                run = Run(child, paragraph)
+                runs.append({"text": raw_text, "formatting": extract_run_format(run)})
+                md_parts.append(run_to_markdown(run, raw_text, in_table=in_table))
 
-        alignment = None
-        if paragraph.alignment is not None:
-            alignment = str(paragraph.alignment)
+        text = "".join(text_parts)
+        markdown = "".join(md_parts) if md_parts else normalize_text(text, in_table=in_table)
 
-        return {
+        alignment = paragraph.alignment
+        if alignment is not None:
+            alignment = _enum_str(alignment)
+
+        info = {
             "type": block_type,
-            "text": paragraph.text or "",
+            "text": text,
             "style": style_name,
             "style_id": style_id,
             "alignment": alignment,
@@ -322,28 +407,18 @@ def word_reader(virtual_docx_path: str, max_blocks: int = 200) -> dict:
             "heading_level": heading_level,
             "runs": runs,
         }
+        return info, markdown
 
-    def table_to_markdown(table: Table) -> Tuple[str, List[List[str]]]:
-        rows: List[List[str]] = []
-        for row in table.rows:
-            row_cells: List[str] = []
-            for cell in row.cells:
-                paragraphs = []
-                for paragraph in cell.paragraphs:
-                    text = paragraph_to_markdown(paragraph, in_table=True).strip()
-                    if text:
-                        paragraphs.append(text)
-                cell_text = "<br>".join(paragraphs) if paragraphs else ""
-                row_cells.append(cell_text)
-            rows.append(row_cells)
-
+    def table_to_markdown(rows: List[List[str]], col_count: int) -> str:
         if not rows:
-            return "", []
+            return ""
 
-        col_count = max(len(row) for row in rows)
+        # Short rows are padded from one shared run of empty cells.
+        padding = [""] * col_count
         for row in rows:
-            if len(row) < col_count:
-                row.extend([""] * (col_count - len(row)))
+            missing = col_count - len(row)
+            if missing:
+                row.extend(padding[:missing])
 
         header = rows[0]
         separator = ["---"] * col_count
@@ -358,105 +433,142 @@ def word_reader(virtual_docx_path: str, max_blocks: int = 200) -> dict:
         ]
         for row in body_rows:
             markdown_lines.append(format_row(row))
-        return "\n".join(markdown_lines), rows
+        return "\n".join(markdown_lines)
 
-    def extract_table_info(table: Table) -> Dict[str, Any]:
+    def extract_table_info(table: Table) -> Tuple[Dict[str, Any], str]:
+        """Return the block info and Markdown for ``table`` from one walk over its cells."""
         rows_info: List[List[Dict[str, Any]]] = []
+        md_rows: List[List[str]] = []
         for row in table.rows:
             row_info: List[Dict[str, Any]] = []
+            md_row: List[str] = []
             for cell in row.cells:
-                cell_paragraphs = [extract_paragraph_info(p) for p in cell.paragraphs]
-                cell_text = "\n".join(p["text"] for p in cell_paragraphs if p["text"])
+                cell_paragraphs: List[Dict[str, Any]] = []
+                cell_md: List[str] = []
+                for paragraph in cell.paragraphs:
+                    info, markdown = extract_paragraph_info(paragraph, in_table=True)
+                    cell_paragraphs.append(info)
+                    markdown = markdown.strip()
+                    if markdown:
+                        cell_md.append(markdown)
                 row_info.append(
                     {
-                        "text": cell_text,
+                        "text": "\n".join(p["text"] for p in cell_paragraphs if p["text"]),
                         "paragraphs": cell_paragraphs,
                     }
                 )
+                md_row.append("<br>".join(cell_md))
             rows_info.append(row_info)
+            md_rows.append(md_row)
 
-        column_count = 0
-        if table.rows:
-            column_count = max(len(row.cells) for row in table.rows)
+        column_count = max((len(row) for row in rows_info), default=0)
 
-        return {
+        info = {
             "type": "table",
-            "row_count": len(table.rows),
+            "row_count": len(rows_info),
             "column_count": column_count,
             "rows": rows_info,
         }
+        return info, table_to_markdown(md_rows, column_count)
 
+    # core_properties builds a new wrapper per access and each field is an
+    # element lookup; bind the wrapper and read every field once.
+    core = document.core_properties
+    created = core.created
+    modified = core.modified
     metadata = {
-        "title": document.core_properties.title,
-        "subject": document.core_properties.subject,
-        "author": document.core_properties.author,
-        "created": document.core_properties.created.isoformat() if document.core_properties.created else None,
-        "modified": document.core_properties.modified.isoformat() if document.core_properties.modified else None,
-        "last_modified_by": document.core_properties.last_modified_by,
-        "revision": document.core_properties.revision,
+        "title": core.title,
+        "subject": core.subject,
+        "author": core.author,
+        "created": created.isoformat() if created else None,
+        "modified": modified.isoformat() if modified else None,
+        "last_modified_by": core.last_modified_by,
+        "revision": core.revision,
     }
 
     blocks: List[Dict[str, Any]] = []
-    markdown_blocks: List[str] = []
+    # Blocks are written straight into one buffer, separated by blank lines,
+    # so each block string can be freed as soon as it is emitted.
+    md_buf = io.StringIO()
+    needs_sep = False
     list_buffer: List[str] = []
     current_list_type: Optional[str] = None
     truncated = False
 
+    def write_block(chunk: str) -> None:
+        nonlocal needs_sep
+        if needs_sep:
+            md_buf.write("\n\n")
+        md_buf.write(chunk)
+        needs_sep = True
+
     def flush_list_buffer() -> None:
         nonlocal current_list_type
         if list_buffer:
-            markdown_blocks.append("\n".join(list_buffer))
+            # Stray single list paragraphs are common; skip the join for them.
+            write_block(list_buffer[0] if len(list_buffer) == 1 else "\n".join(list_buffer))
             list_buffer.clear()
         current_list_type = None
 
     block_limit = max_blocks if max_blocks and max_blocks > 0 else None
 
-    for block in iter_block_items(document):
+    def handle_paragraph(element) -> None:
+        nonlocal current_list_type
+        info, text_md = extract_paragraph_info(Paragraph(element, document))
+        blocks.append(info)
+
+        # The block info already carries the style classification; reuse it
+        # rather than resolving the paragraph style a second time.
+        heading_level = info["heading_level"]
+        list_type = info["list_type"]
+        list_level = info["list_level"]
+        is_quote = info["type"] == "quote"
+        text_md = text_md.strip()
+
+        if list_type:
+            if current_list_type and list_type != current_list_type:
+                flush_list_buffer()
+            current_list_type = list_type
+            indent = "  " * ((list_level or 1) - 1)
+            prefix = "- " if list_type == "bullet" else "1. "
+            list_buffer.append(f"{indent}{prefix}{text_md}")
+            return
+
+        flush_list_buffer()
+
+        if heading_level:
+            write_block(f"{'#' * heading_level} {text_md}".rstrip())
+        elif is_quote:
+            quote_lines = text_md.splitlines() or [""]
+            # A list lets join size the result in one pass; each line keeps its
+            # rstrip because hard breaks end in two spaces.
+            write_block("\n".join([f"> {line}".rstrip() for line in quote_lines]))
+        else:
+            write_block(text_md)
+
+    def handle_table(element) -> None:
+        flush_list_buffer()
+        info, table_markdown = extract_table_info(Table(element, document))
+        if table_markdown:
+            write_block(table_markdown)
+        blocks.append(info)
+
+    # python-docx maps each body element tag to exactly one oxml class, so the
+    # element type selects the handler; other body children (sectPr, ...) are skipped.
+    block_handlers = {CT_P: handle_paragraph, CT_Tbl: handle_table}
+
+    for child in document.element.body.iterchildren():
+        handler = block_handlers.get(type(child))
+        if handler is None:
+            continue
         if block_limit is not None and len(blocks) >= block_limit:
             truncated = True
             break
-
-        if isinstance(block, Paragraph):
-            info = extract_paragraph_info(block)
-            blocks.append(info)
-
-            style = block.style
-            style_name = style.name if style else None
-            style_id = style.style_id if style else None
-            heading_level = detect_heading_level(style_id, style_name)
-            list_type, list_level = detect_list_info(block, style_id, style_name)
-            is_quote = is_quote_style(style_id, style_name)
-            text_md = paragraph_to_markdown(block).strip()
-
-            if list_type:
-                if current_list_type and list_type != current_list_type:
-                    flush_list_buffer()
-                current_list_type = list_type
-                indent = "  " * ((list_level or 1) - 1)
-                prefix = "- " if list_type == "bullet" else "1. "
-                list_buffer.append(f"{indent}{prefix}{text_md}")
-                continue
-
-            flush_list_buffer()
-
-            if heading_level:
-                markdown_blocks.append(f"{'#' * heading_level} {text_md}".rstrip())
-            elif is_quote:
-                quote_lines = text_md.splitlines() or [""]
-                markdown_blocks.append("\n".join(f"> {line}".rstrip() for line in quote_lines))
-            else:
-                markdown_blocks.append(text_md)
-
-        elif isinstance(block, Table):
-            flush_list_buffer()
-            table_markdown, _ = table_to_markdown(block)
-            if table_markdown:
-                markdown_blocks.append(table_markdown)
-            blocks.append(extract_table_info(block))
+        handler(child)
 
     flush_list_buffer()
 
-    markdown_output = "\n\n".join(markdown_blocks).strip()
+    markdown_output = md_buf.getvalue().strip()
 
     return {
         "status": "ok",
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 from pathlib import Path
-import zipfile
+import heapq
+import os
 import shutil
 import time
 
@@ -9,6 +12,70 @@ from langchain.tools import tool
 
 from smartagent.workspace import WORKSPACE_ROOT, resolve_workspace_path, safe_fix_zip_filename
 
+if TYPE_CHECKING:
+    import zipfile
+
+_ZIP_UTF8_FLAG = 0x800
+_COPY_BUFFER_SIZE = 1024 * 1024
+# Below this many members a thread pool costs more than it saves.
+_PARALLEL_UNZIP_MIN_MEMBERS = 16
+_MAX_UNZIP_WORKERS = 8
+
+
+def _member_target(output_dir: Path, info: zipfile.ZipInfo) -> Path:
+    """Map a ZIP member to its extraction path, rejecting traversal."""
+    name = info.filename
+    # Bit 11 marks the name as UTF-8; zipfile has already decoded it.
+    if not info.flag_bits & _ZIP_UTF8_FLAG:
+        name = safe_fix_zip_filename(name)
+
+    parts = [
+        part
+        for part in name.replace("\\", "/").split("/")
+        if part not in ("", ".")
+    ]
+    if ".." in parts:
+        raise ValueError(f"Unsafe path in zip archive: {info.filename}")
+    return output_dir.joinpath(*parts)
+
+
+def _plan_extraction(infos: list[zipfile.ZipInfo], output_dir: Path) -> list[tuple[zipfile.ZipInfo, Path]]:
+    """
+    Resolve every member's target and create the directory tree once.
+
+    All names are validated before anything is written, and each distinct
+    parent directory is created a single time rather than once per file.
+    """
+    plan = []
+    dirs = set()
+    for info in infos:
+        target = _member_target(output_dir, info)
+        if info.is_dir():
+            dirs.add(target)
+        else:
+            dirs.add(target.parent)
+            plan.append((info, target))
+
+    for directory in sorted(dirs):
+        directory.mkdir(parents=True, exist_ok=True)
+    return plan
+
+
+def _copy_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, target: Path) -> None:
+    """Stream one member to disk without mutating ``info.filename``."""
+    with zf.open(info) as src, open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst, length=_COPY_BUFFER_SIZE)
+
+
+def _extract_shard(zip_path: Path, plan: list[tuple[zipfile.ZipInfo, Path]]) -> None:
+    import zipfile
+
+    # ZipFile handles are not safe for concurrent reads; each worker opens its own.
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        for info, target in plan:
+            _copy_member(zf, info, target)
+
+
 @tool(parse_docstring=True)
 def unzip_workspace_file(virtual_zip_path: str) -> dict:
     """
@@ -64,6 +131,8 @@ def unzip_workspace_file(virtual_zip_path: str) -> dict:
     #     "num_files": len(zf.namelist()),
     # }
 
+    import zipfile
+
     zip_path = resolve_workspace_path(virtual_zip_path)
 
     if not zip_path.exists():
@@ -77,9 +146,22 @@ def unzip_workspace_file(virtual_zip_path: str) -> dict:
 
     with zipfile.ZipFile(zip_path, "r") as zf:
         infos = zf.infolist()
-        for info in infos:
-            info.filename = safe_fix_zip_filename(info.filename)
-            zf.extract(info, output_dir)
+        plan = _plan_extraction(infos, output_dir)
+        if len(plan) < _PARALLEL_UNZIP_MIN_MEMBERS:
+            for info, target in plan:
+                _copy_member(zf, info, target)
+
+    if len(plan) >= _PARALLEL_UNZIP_MIN_MEMBERS:
+        workers = min(_MAX_UNZIP_WORKERS, os.cpu_count() or 1)
+        shards = [plan[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_extract_shard, zip_path, shard)
+                for shard in shards
+                if shard
+            ]
+            for future in futures:
+                future.result()
 
     return {
         "status": "ok",
@@ -88,6 +170,14 @@ def unzip_workspace_file(virtual_zip_path: str) -> dict:
         "num_files": len(infos),
     }
 
+
+def _sorted_entries(path, limit: int) -> list[os.DirEntry]:
+    """Return the first ``limit`` entries of ``path`` by name."""
+    with os.scandir(path) as it:
+        # Bounded heap: a huge directory under a small budget costs O(n log k).
+        return heapq.nsmallest(limit, it, key=lambda e: e.name)
+
+
 @tool(parse_docstring=True)
 def tree_view_workspace(
     virtual_path: str,
@@ -139,22 +229,24 @@ def tree_view_workspace(
     lines = []
     count = 0
 
-    def walk(path: Path, prefix: str = "", depth: int = 0):
-        nonlocal count
-        if depth > max_depth or count >= max_entries:
-            return
-
-        for p in sorted(path.iterdir()):
-            if count >= max_entries:
-                return
-
-            lines.append(f"{prefix}{p.name}")
-            count += 1
-
-            if p.is_dir():
-                walk(p, prefix + "  ", depth + 1)
-
-    walk(root)
+    # One indentation string per depth, shared by every entry at that depth.
+    # Each level down costs an entry, so depth never exceeds max_entries.
+    prefixes = tuple("  " * depth for depth in range(min(max_depth, max_entries) + 1))
+
+    # Explicit stack of (entry, depth), popped in pre-order. DirEntry carries
+    # the d_type from the directory read, so is_dir() needs no stat.
+    stack = [(e, 0) for e in reversed(_sorted_entries(root, max_entries))] if max_depth >= 0 else []
+    while stack and count < max_entries:
+        entry, depth = stack.pop()
+        lines.append(prefixes[depth] + entry.name)
+        count += 1
+
+        # Children print before any queued sibling, so at most the remaining
+        # budget of them can be listed; once it is spent skip the scan.
+        if count < max_entries and depth < max_depth and entry.is_dir(follow_symlinks=False):
+            stack.extend(
+                (e, depth + 1) for e in reversed(_sorted_entries(entry.path, max_entries - count))
+            )
 
     return {
         "root": virtual_path,
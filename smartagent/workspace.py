@@ -1,14 +1,14 @@
-from pathlib import Path
-from langchain.tools import tool
-from langgraph.types import Overwrite
-
-from smartagent.renderer import _DEFAULT_RENDERER
-from rich.panel import Panel
-from rich.text import Text
-
+import os
+from functools import lru_cache
 from pathlib import Path
 
 WORKSPACE_ROOT = Path("./workspace").resolve()
+_WORKSPACE_ROOT_STR = str(WORKSPACE_ROOT)
+# Trailing separator so that e.g. "/srv/workspace-other" is not accepted.
+_WORKSPACE_PREFIX = os.path.join(_WORKSPACE_ROOT_STR, "")
+
+# Encodings tried, in order, when recovering legacy (non-UTF-8) ZIP filenames.
+_CANDIDATE_ENCODINGS = ("utf-8", "gbk", "gb18030")
 
 
 def resolve_workspace_path(virtual_path: str) -> Path:
@@ -28,30 +28,36 @@ def resolve_workspace_path(virtual_path: str) -> Path:
     if virtual_path == "/workspace":
         return WORKSPACE_ROOT
 
-    if virtual_path.startswith("/workspace/"):
-        relative = virtual_path[len("/workspace/") :]
-        real_path = (WORKSPACE_ROOT / relative).resolve()
-    else:
+    if not virtual_path.startswith("/workspace/"):
         raise ValueError(f"Invalid workspace path: {virtual_path}")
 
+    relative = virtual_path[len("/workspace/") :]
+    real_path = (WORKSPACE_ROOT / relative).resolve()
+
     # Enforce sandboxing
-    if not str(real_path).startswith(str(WORKSPACE_ROOT)):
+    real_str = str(real_path)
+    if real_str != _WORKSPACE_ROOT_STR and not real_str.startswith(_WORKSPACE_PREFIX):
         raise ValueError(f"Path traversal detected: {virtual_path}")
 
     return real_path
 
 
+@lru_cache(maxsize=4096)
 def safe_fix_zip_filename(name: str) -> str:
     """
     Attempt to fix garbled ZIP filenames produced by legacy tools.
     Never raises UnicodeEncodeError.
     """
+    if name.isascii():
+        # ASCII decodes identically under every candidate encoding.
+        return name
+
     try:
         raw = name.encode("latin1")  # latin1 is always reversible
     except Exception:
         return name
 
-    for enc in ("utf-8", "gbk", "gb18030"):
+    for enc in _CANDIDATE_ENCODINGS:
         try:
             return raw.decode(enc)
         except UnicodeDecodeError:
@@ -59,13 +65,3 @@ def safe_fix_zip_filename(name: str) -> str:
 
     return name
 
-
-_DEFAULT_RENDERER.console.print(
-    Panel(
-        Text("Initialize unzip tool."),
-        title="STEP 3: Initialize Tools",
-        border_style="purple",
-        padding=(1, 2),
-    )
-)
-import zipfile
@@ -0,0 +1,19 @@
+"""Shared fixtures for smartagent unit tests."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from smartagent import workspace
+
+
+@pytest.fixture
+def workspace_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the ``/workspace`` sandbox at a fresh temporary directory."""
+    root = (tmp_path / "workspace").resolve()
+    root.mkdir()
+    monkeypatch.setattr(workspace, "WORKSPACE_ROOT", root)
+    monkeypatch.setattr(workspace, "_WORKSPACE_ROOT_STR", str(root))
+    monkeypatch.setattr(workspace, "_WORKSPACE_PREFIX", os.path.join(str(root), ""))
+    return root
@@ -0,0 +1,18 @@
+"""Unit tests for the orchestrator system prompts in smartagent.prompts."""
+
+import pytest
+
+from smartagent.prompts import ORCHESTRATOR_SANDBOX_PROMPT, ORCHESTRATOR_SYSTEM_PROMPT
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        pytest.param(ORCHESTRATOR_SYSTEM_PROMPT, id="system"),
+        pytest.param(ORCHESTRATOR_SANDBOX_PROMPT, id="sandbox"),
+    ],
+)
+def test_orchestrator_prompt_has_no_template_fields(prompt: str) -> None:
+    """The cached prompt prefix is static text, never a format template."""
+    assert "{" not in prompt
+    assert prompt == prompt.strip()
@@ -0,0 +1,65 @@
+"""Unit tests for the Excel tools in smartagent.tools.data."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+from openpyxl.styles import Font  # noqa: E402
+
+from smartagent.tools.data import excel_schema_reader  # noqa: E402
+
+
+def make_workbook(path: Path, rows: list[list], styled: tuple[str, ...] = ()) -> Path:
+    """Write ``rows`` from A1, leaving None cells absent, and bold ``styled`` cells."""
+    workbook = openpyxl.Workbook()
+    ws = workbook.active
+    ws.title = "Sheet1"
+    for r, row in enumerate(rows, start=1):
+        for c, value in enumerate(row, start=1):
+            if value is not None:
+                ws.cell(row=r, column=c, value=value)
+    for cell in styled:
+        ws[cell].font = Font(bold=True)
+    workbook.save(path)
+    return path
+
+
+def read_excel_schema(path: Path) -> dict:
+    """The schema excel_schema_reader derived from a full pd.read_excel."""
+    return {
+        name: {
+            "num_rows": len(df),
+            "columns": [{"name": col, "dtype": str(dtype)} for col, dtype in df.dtypes.items()],
+        }
+        for name, df in pd.read_excel(path, sheet_name=None).items()
+    }
+
+
+@pytest.mark.parametrize(
+    ("rows", "styled"),
+    [
+        pytest.param([["a", "b", "c"], [1, 2, 3], [4, 5, 6]], ("E20",), id="styled-empty-cell"),
+        pytest.param([[None, None], ["a", "b"], [1, 2], [3, 4]], (), id="leading-blank-row"),
+        pytest.param([["a", "b"], [1, 2], [None, None], [3, 4], [5, 6]], (), id="blank-rows-in-data"),
+    ],
+)
+def test_excel_schema_reader_matches_read_excel(workspace_root: Path, rows: list[list], styled: tuple[str, ...]) -> None:
+    """Columns, dtypes and row counts agree with pandas on irregular sheets."""
+    path = make_workbook(workspace_root / "data.xlsx", rows, styled)
+
+    result = excel_schema_reader.invoke({"virtual_excel_path": "/workspace/data.xlsx"})
+
+    assert result["status"] == "ok"
+    assert result["sheets"] == read_excel_schema(path)
+
+
+def test_excel_schema_reader_samples_dtypes(workspace_root: Path) -> None:
+    """Dtypes come from the leading sample while every data row is counted."""
+    rows = [["n"]] + [[i] for i in range(60)] + [["text"]]
+    make_workbook(workspace_root / "data.xlsx", rows)
+
+    result = excel_schema_reader.invoke({"virtual_excel_path": "/workspace/data.xlsx"})
+
+    assert result["sheets"]["Sheet1"] == {"num_rows": 61, "columns": [{"name": "n", "dtype": "int64"}]}
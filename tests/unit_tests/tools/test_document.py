@@ -0,0 +1,52 @@
+"""Unit tests for the document readers in smartagent.tools.document."""
+
+from pathlib import Path
+
+import pytest
+
+pypdf = pytest.importorskip("pypdf")
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject  # noqa: E402
+
+from smartagent.tools import document  # noqa: E402
+from smartagent.tools.document import pdf_reader  # noqa: E402
+
+
+def make_pdf(path: Path, num_pages: int) -> Path:
+    """Write a PDF whose page ``i`` shows the text ``page i``."""
+    writer = pypdf.PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for i in range(num_pages):
+        page = writer.add_blank_page(width=612, height=792)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 720 Td (page {i}) Tj ET".encode("ascii"))
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    with path.open("wb") as handle:
+        writer.write(handle)
+    return path
+
+
+def test_pdf_reader_parallel_matches_serial(workspace_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The process-pool path returns the same text, in page order, as the serial one."""
+    num_pages = document._PARALLEL_PDF_MIN_PAGES + 8
+    make_pdf(workspace_root / "doc.pdf", num_pages)
+    args = {"virtual_pdf_path": "/workspace/doc.pdf", "num_pages": num_pages}
+
+    monkeypatch.setattr(document.os, "cpu_count", lambda: 1)
+    serial = pdf_reader.invoke(args)
+    monkeypatch.setattr(document.os, "cpu_count", lambda: 2)
+    parallel = pdf_reader.invoke(args)
+
+    assert serial["status"] == "ok"
+    assert serial["content"].splitlines() == [f"page {i}" for i in range(num_pages)]
+    assert parallel == serial